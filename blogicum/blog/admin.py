@@ -1,7 +1,17 @@
 from django.contrib import admin
+from django.db.models import Q
 
+from .admin_filters import AutocompleteFilter, AutocompleteFilterMixin
 from .constants import COMMENT_ADMIN_TEXT_SHORT_LENGTH
 from .models import Category, Comment, Location, Post
+from .search import (
+    POST_INDEXED_FIELDS,
+    get_matching_ids,
+    get_search_terms,
+    has_search_index,
+    make_match_query,
+)
+from .services import recount_comment_counts
 
 
 @admin.register(Category)
@@ -20,20 +30,69 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'pub_date', 'category', 'is_published')
+class PostAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'pub_date', 'category', 'is_published',
+        'comment_count',
+    )
     search_fields = ('title', 'text', 'author__username', 'category__title')
-    list_filter = ('is_published', 'category', 'author', 'pub_date')
+    list_filter = (
+        'is_published',
+        'category',
+        ('author', AutocompleteFilter),
+        'pub_date',
+    )
     date_hierarchy = 'pub_date'
     ordering = ('-pub_date',)
     raw_id_fields = ('author', 'category', 'location')
+    actions = ('recount_comments',)
+
+    def get_related_search_condition(self, field, term):
+        name, _, lookup = field.partition('__')
+        if not lookup:
+            return Q(**{f'{field}__icontains': term})
+        related = self.opts.get_field(name).related_model
+        return Q(**{
+            f'{name}__in': related._default_manager.filter(
+                **{f'{lookup}__icontains': term}
+            ).values('pk')
+        })
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not has_search_index():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        other_fields = [
+            field for field in self.get_search_fields(request)
+            if field not in POST_INDEXED_FIELDS
+        ]
+        condition = Q()
+        for term in get_search_terms(search_term):
+            match = make_match_query(term)
+            term_condition = Q(pk__in=get_matching_ids(match) if match else [])
+            for field in other_fields:
+                term_condition |= self.get_related_search_condition(
+                    field, term
+                )
+            condition &= term_condition
+        return queryset.filter(condition), False
+
+    @admin.action(description='Пересчитать комментарии')
+    def recount_comments(self, request, queryset):
+        repaired = recount_comment_counts(queryset)
+        self.message_user(request, f'Исправлено счётчиков: {repaired}')
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = ('post', 'author', 'created_date', 'text_short')
     search_fields = ('text', 'author__username', 'post__title')
-    list_filter = ('post', 'author', 'created_date')
+    list_filter = (
+        ('post', AutocompleteFilter),
+        ('author', AutocompleteFilter),
+        'created_date',
+    )
     date_hierarchy = 'created_date'
     ordering = ('-created_date',)
     raw_id_fields = ('post', 'author')
@@ -0,0 +1,51 @@
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.urls import reverse
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    template = 'admin/blog/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+        self.autocomplete_url = reverse(
+            f'{model_admin.admin_site.name}:autocomplete'
+        )
+        self.app_label = field.model._meta.app_label
+        self.model_name = field.model._meta.model_name
+        self.field_name = field.name
+
+    def has_output(self):
+        return True
+
+    def field_choices(self, field, request, model_admin):
+        if not self.lookup_val:
+            return []
+        related_model = field.remote_field.model
+        target = field.target_field.name
+        return [
+            (getattr(obj, target), str(obj))
+            for obj in related_model._default_manager.filter(
+                **{f'{target}__in': self.lookup_val}
+            )[:len(self.lookup_val)]
+        ]
+
+
+class AutocompleteFilterMixin:
+    @property
+    def media(self):
+        media = super().media
+        for list_filter in self.list_filter:
+            if (isinstance(list_filter, (tuple, list))
+                    and issubclass(list_filter[1], AutocompleteFilter)):
+                field = self.model._meta.get_field(list_filter[0])
+                return media + AutocompleteSelect(
+                    field, self.admin_site
+                ).media + forms.Media(
+                    js=['blog/js/autocomplete_filter.js']
+                )
+        return media
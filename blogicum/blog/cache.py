@@ -0,0 +1,98 @@
+import hashlib
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .constants import CACHE_TAG_PREFIX, INDEX_FEED_CACHE_TAG
+
+
+def is_process_local_cache():
+    return isinstance(
+        caches[DEFAULT_CACHE_ALIAS], (DummyCache, LocMemCache)
+    )
+
+
+def _tag_key(tag):
+    return f'{CACHE_TAG_PREFIX}:{tag}'
+
+
+def get_tag_versions(tags):
+    keys = {_tag_key(tag): tag for tag in tags}
+    stored = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in stored}
+    if missing:
+        cache.set_many(missing, None)
+        stored.update(missing)
+    return {keys[key]: version for key, version in stored.items()}
+
+
+def bump_tags(*tags):
+    for tag in tags:
+        key = _tag_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def make_cache_key(prefix, *parts):
+    digest = hashlib.md5(
+        repr(parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+def make_tag(kind, pk):
+    return f'{kind}:{pk}'
+
+
+def get_post_tags(post):
+    tags = [
+        make_tag('post', post.pk),
+        make_tag('user', post.author_id),
+    ]
+    if post.category_id:
+        tags.append(make_tag('category', post.category_id))
+    if post.location_id:
+        tags.append(make_tag('location', post.location_id))
+    return tags
+
+
+def get_comment_tags(comment):
+    return [
+        make_tag('comment', comment.pk),
+        make_tag('user', comment.author_id),
+    ]
+
+
+def get_post_feed_tags(post):
+    tags = [
+        INDEX_FEED_CACHE_TAG,
+        make_tag('feed:profile', post.author_id),
+    ]
+    if post.category_id:
+        tags.append(make_tag('feed:category', post.category_id))
+    return tags
+
+
+def bump_post_tags(posts, *tags):
+    tags = set(tags)
+    for post in posts:
+        tags.add(make_tag('post', post.pk))
+        tags.update(get_post_feed_tags(post))
+    bump_tags(*tags)
+
+
+def get_card_version(post, versions):
+    return tuple(versions[tag] for tag in get_post_tags(post))
+
+
+def prefetch_card_versions(posts):
+    posts = list(posts)
+    versions = get_tag_versions(
+        {tag for post in posts for tag in get_post_tags(post)}
+    )
+    for post in posts:
+        post.card_version = get_card_version(post, versions)
@@ -2,6 +2,103 @@ COMMENT_ADMIN_TEXT_SHORT_LENGTH = 20
 
 COMMENT_TEXT_SNIPPET_LENGTH = 30
 
+POST_EXCERPT_WORDS = 10
+
+POST_EXCERPT_MAX_LENGTH = 512
+
 POSTS_PER_PAGE = 10
 
+PAGE_RANGE_ON_EACH_SIDE = 2
+
+PAGE_RANGE_ON_ENDS = 1
+
 POST_ORDERING = '-pub_date'
+
+POST_ORDERING_TIEBREAKER = '-id'
+
+CURSOR_QUERY_PARAM = 'cursor'
+
+CURSOR_NEXT = 'n'
+
+CURSOR_PREVIOUS = 'p'
+
+CACHE_TAG_PREFIX = 'blog:tag'
+
+FEEDS_CACHE_TAG = 'feeds'
+
+FEED_COUNT_CACHE_PREFIX = 'blog:feed_count'
+
+FEED_COUNT_CACHE_TIMEOUT = 60
+
+FEED_COUNT_ESTIMATE_LIMIT = 1000
+
+FEED_COUNT_STRATEGY = 'cached'
+
+FEED_AS_ROWS = True
+
+RECOUNT_BATCH_SIZE = 1000
+
+SCHEDULER_POLL_INTERVAL = 60
+
+SCHEDULER_HORIZON = 60 * 60
+
+NEXT_VISIBILITY_CHANGE_CACHE_PREFIX = 'blog:next_visibility_change'
+
+INDEX_FEED_CACHE_TAG = 'feed:index'
+
+ALL_FEEDS_CACHE_TAG = 'feed:all'
+
+COMMENT_COUNTS_CACHE_TAG = 'comment_counts'
+
+RELATED_CACHE_TAG = 'related'
+
+PAGE_CACHE_PREFIX = 'blog:page'
+
+PAGE_CACHE_STATS_PREFIX = 'blog:page_cache_stats'
+
+PAGE_CACHE_TIMEOUT = 5 * 60
+
+PAGE_CACHE_QUERY_PARAMS = ('page', 'cursor', 'q')
+
+POST_CARD_CACHE_PREFIX = 'blog:post_card'
+
+POST_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+
+COMMENTS_PER_PAGE = 50
+
+IMAGE_UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+
+IMAGE_MAX_PIXELS = 40_000_000
+
+IMAGE_ORIGINAL_QUALITY = 90
+
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)
+
+IMAGE_RENDITION_FORMATS = {
+    'jpeg': 'JPEG',
+    'webp': 'WEBP',
+}
+
+IMAGE_RENDITION_QUALITY = 80
+
+IMAGE_PLACEHOLDER_SIZE = 16
+
+IMAGE_PLACEHOLDER_QUALITY = 30
+
+IMAGE_WORKERS = 2
+
+MEDIA_GC_MIN_AGE = 24 * 60 * 60
+
+SEARCH_QUERY_PARAM = 'q'
+
+SEARCH_QUERY_MAX_LENGTH = 200
+
+SEARCH_TITLE_WEIGHT = 10.0
+
+TYPEAHEAD_LIMIT = 10
+
+TYPEAHEAD_MAX_LENGTH = 100
+
+TYPEAHEAD_REBUILD_INTERVAL = 5 * 60
+
+TYPEAHEAD_RECENT_LIMIT = 1000
@@ -3,8 +3,12 @@ import os
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
 
+from .constants import IMAGE_MAX_PIXELS, IMAGE_UPLOAD_MAX_SIZE
 from .models import Comment, Post
 
 User = get_user_model()
@@ -16,6 +20,48 @@ class ProfileEditForm(forms.ModelForm):
         fields = ('first_name', 'last_name', 'username', 'email')
 
 
+class PostImageField(forms.ImageField):
+    default_error_messages = {
+        'too_large': 'Размер файла не должен превышать %(limit)s.',
+        'too_many_pixels': (
+            'Изображение слишком большое: не более %(limit)s пикселей.'
+        ),
+    }
+
+    def to_python(self, data):
+        if data not in self.empty_values:
+            if getattr(data, 'size', 0) > IMAGE_UPLOAD_MAX_SIZE:
+                raise ValidationError(
+                    self.error_messages['too_large'],
+                    code='too_large',
+                    params={'limit': filesizeformat(IMAGE_UPLOAD_MAX_SIZE)},
+                )
+            self.check_pixel_count(data)
+        return super().to_python(data)
+
+    def check_pixel_count(self, data):
+        source = (
+            data.temporary_file_path()
+            if hasattr(data, 'temporary_file_path') else data
+        )
+        try:
+            with Image.open(source) as image:
+                width, height = image.size
+        except Image.DecompressionBombError:
+            width, height = IMAGE_MAX_PIXELS, IMAGE_MAX_PIXELS
+        except Exception:
+            return
+        finally:
+            if hasattr(data, 'seek'):
+                data.seek(0)
+        if width * height > IMAGE_MAX_PIXELS:
+            raise ValidationError(
+                self.error_messages['too_many_pixels'],
+                code='too_many_pixels',
+                params={'limit': f'{IMAGE_MAX_PIXELS:,}'.replace(',', ' ')},
+            )
+
+
 class PostForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -31,6 +77,7 @@ class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         fields = ['title', 'text', 'category', 'image', 'is_published']
+        field_classes = {'image': PostImageField}
 
 
 class CommentForm(forms.ModelForm):
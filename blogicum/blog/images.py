@@ -0,0 +1,222 @@
+import base64
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import bump_tags, get_post_feed_tags, make_tag
+from .constants import (
+    IMAGE_MAX_PIXELS,
+    IMAGE_ORIGINAL_QUALITY,
+    IMAGE_PLACEHOLDER_QUALITY,
+    IMAGE_PLACEHOLDER_SIZE,
+    IMAGE_RENDITION_FORMATS,
+    IMAGE_RENDITION_QUALITY,
+    IMAGE_RENDITION_WIDTHS,
+    IMAGE_WORKERS,
+    RECOUNT_BATCH_SIZE,
+)
+from .models import IMAGE_METADATA_FIELDS, Post
+
+logger = logging.getLogger(__name__)
+
+STRIPPED_FORMATS = {
+    'JPEG': 'JPEG',
+    'MPO': 'JPEG',
+    'PNG': 'PNG',
+    'WEBP': 'WEBP',
+}
+
+executor = ThreadPoolExecutor(
+    max_workers=IMAGE_WORKERS, thread_name_prefix='blog-images'
+)
+
+
+def get_rendition_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}.{width}w.{extension}'
+
+
+def get_srcset(image, renditions, extension):
+    return ', '.join(
+        '{} {}w'.format(
+            image.storage.url(rendition[extension]), rendition['width']
+        )
+        for rendition in renditions
+    )
+
+
+def _encode(image, image_format, quality=IMAGE_RENDITION_QUALITY):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(
+        buffer,
+        image_format,
+        quality=quality,
+        icc_profile=image.info.get('icc_profile'),
+    )
+    return buffer.getvalue()
+
+
+def make_placeholder(image):
+    placeholder = image.copy()
+    placeholder.thumbnail((IMAGE_PLACEHOLDER_SIZE, IMAGE_PLACEHOLDER_SIZE))
+    data = base64.b64encode(
+        _encode(placeholder, 'WEBP', IMAGE_PLACEHOLDER_QUALITY)
+    ).decode()
+    return f'data:image/webp;base64,{data}'
+
+
+def _strip_metadata(image):
+    image_format = STRIPPED_FORMATS.get(image.format)
+    if image_format is None or not image.getexif():
+        return image, None
+    image = ImageOps.exif_transpose(image)
+    return image, _encode(image, image_format, IMAGE_ORIGINAL_QUALITY)
+
+
+def make_renditions(storage, name, upload_name):
+    renditions = {}
+    with storage.open(name) as file, Image.open(file) as original:
+        if original.width * original.height > IMAGE_MAX_PIXELS:
+            raise ValueError(f'{name}: слишком много пикселей')
+        image, stripped = _strip_metadata(original)
+        width, height = image.size
+        if stripped is None:
+            largest = IMAGE_RENDITION_WIDTHS[-1]
+            image.draft(image.mode, (largest, largest * height // width))
+        placeholder = make_placeholder(image)
+        for rendition_width in IMAGE_RENDITION_WIDTHS:
+            if rendition_width >= width:
+                break
+            rendition = image.copy()
+            rendition.thumbnail((rendition_width, height))
+            renditions[rendition_width] = {
+                extension: _encode(rendition, image_format)
+                for extension, image_format in IMAGE_RENDITION_FORMATS.items()
+            }
+
+    fields = {
+        'image_width': width,
+        'image_height': height,
+        'image_placeholder': placeholder,
+    }
+    if stripped is not None:
+        name = fields['image'] = storage.save(
+            upload_name, ContentFile(stripped)
+        )
+    fields['image_renditions'] = []
+    for rendition_width, contents in renditions.items():
+        rendition = {'width': rendition_width}
+        for extension, content in contents.items():
+            rendition[extension] = storage.save(
+                get_rendition_name(name, rendition_width, extension),
+                ContentFile(content),
+            )
+        fields['image_renditions'].append(rendition)
+    return fields
+
+
+def _get_upload_name(post):
+    _, extension = os.path.splitext(post.image.name)
+    return post.image.field.generate_filename(post, f'original{extension}')
+
+
+def generate_renditions(post_id):
+    post = (
+        Post.objects.filter(pk=post_id)
+        .only('id', 'image', 'author_id', 'category_id')
+        .first()
+    )
+    if post is None or not post.image:
+        return []
+    storage, name = post.image.storage, post.image.name
+    fields = (
+        Post.objects.filter(image=name)
+        .exclude(pk=post_id)
+        .exclude(image_placeholder='')
+        .values(*IMAGE_METADATA_FIELDS)
+        .first()
+    )
+    try:
+        fields = fields or make_renditions(
+            storage, name, _get_upload_name(post)
+        )
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning(
+            'Не удалось создать уменьшенные копии %s', name, exc_info=True
+        )
+        return []
+    if Post.objects.filter(pk=post_id, image=name).update(
+        **fields, updated_at=timezone.now()
+    ):
+        bump_tags(make_tag('post', post_id), *get_post_feed_tags(post))
+    return fields['image_renditions']
+
+
+def get_referenced_names(batch_size=RECOUNT_BATCH_SIZE):
+    names = set()
+    last_pk = 0
+    while True:
+        batch = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .exclude(image='')
+            .order_by('pk')
+            .values_list('pk', 'image', 'image_renditions')[:batch_size]
+        )
+        if not batch:
+            return names
+        for _, image, renditions in batch:
+            names.add(image)
+            for rendition in renditions:
+                names.update(
+                    file_name for key, file_name in rendition.items()
+                    if key != 'width'
+                )
+        last_pk = batch[-1][0]
+
+
+def _walk(storage, directory):
+    directories, files = storage.listdir(directory)
+    for file_name in files:
+        yield f'{directory}/{file_name}'
+    for subdirectory in directories:
+        yield from _walk(storage, f'{directory}/{subdirectory}')
+
+
+def collect_garbage(storage, min_age, dry_run=False):
+    upload_dir = Post._meta.get_field('image').upload_to.split('/')[0]
+    if not storage.exists(upload_dir):
+        return []
+    referenced = get_referenced_names()
+    threshold = timezone.now() - timedelta(seconds=min_age)
+    removed = []
+    for name in _walk(storage, upload_dir):
+        if name in referenced or storage.get_modified_time(name) > threshold:
+            continue
+        if not dry_run:
+            storage.delete(name)
+        removed.append(name)
+    return removed
+
+
+def _run_in_worker(post_id):
+    try:
+        generate_renditions(post_id)
+    except Exception:
+        logger.exception(
+            'Ошибка при создании уменьшенных копий публикации %s', post_id
+        )
+    finally:
+        connections.close_all()
+
+
+def schedule_renditions(post_id):
+    transaction.on_commit(lambda: executor.submit(_run_in_worker, post_id))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump_post_tags
+from blog.constants import RECOUNT_BATCH_SIZE
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Заново вычисляет анонсы публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECOUNT_BATCH_SIZE,
+            help='Количество публикаций, обрабатываемых за один запрос.',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('id', 'text', 'excerpt', 'author_id', 'category_id')
+                [:batch_size]
+            )
+            if not batch:
+                break
+            changed = []
+            for post in batch:
+                excerpt = Post.make_excerpt(post.text)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    changed.append(post)
+            if changed:
+                updated += Post.objects.bulk_update(changed, ['excerpt'])
+                bump_post_tags(changed)
+            last_pk = batch[-1].pk
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено анонсов: {updated}')
+        )
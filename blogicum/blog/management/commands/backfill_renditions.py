@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from blog.constants import RECOUNT_BATCH_SIZE
+from blog.images import generate_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all_posts',
+            help='Пересоздать копии и для публикаций, у которых они есть.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECOUNT_BATCH_SIZE,
+            help='Количество публикаций, выбираемых за один запрос.',
+        )
+
+    def handle(self, *args, all_posts, batch_size, **options):
+        queryset = Post.objects.exclude(image='').exclude(image=None)
+        if not all_posts:
+            queryset = queryset.filter(image_placeholder='')
+        last_pk = 0
+        processed = 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            for post_id in batch:
+                if generate_renditions(post_id):
+                    processed += 1
+            last_pk = batch[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {processed}')
+        )
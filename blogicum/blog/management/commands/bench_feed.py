@@ -0,0 +1,75 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from blog.constants import POSTS_PER_PAGE
+from blog.links import add_card_urls
+from blog.services import get_post_rows, get_posts_queryset
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает загрузку страниц ленты в виде объектов моделей'
+        ' и в виде облегчённых строк.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=10,
+            help='Количество страниц ленты, загружаемых за один проход.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Количество проходов для каждого способа загрузки.',
+        )
+        parser.add_argument(
+            '--render',
+            action='store_true',
+            help='Также отрисовывать карточки публикаций.',
+        )
+
+    def _run(self, hydrate, pages, render):
+        queryset = get_posts_queryset()
+        for number in range(pages):
+            start = number * POSTS_PER_PAGE
+            posts = hydrate(queryset[start:start + POSTS_PER_PAGE])
+            if render:
+                add_card_urls(posts)
+                for post in posts:
+                    render_to_string('includes/post_card.html', {'post': post})
+
+    def _measure(self, hydrate, pages, repeat, render):
+        self._run(hydrate, pages, render)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            self._run(hydrate, pages, render)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        self._run(hydrate, pages, render)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return best, peak
+
+    def handle(self, *args, pages, repeat, render, **options):
+        results = {
+            'Модели': self._measure(list, pages, repeat, render),
+            'Строки': self._measure(get_post_rows, pages, repeat, render),
+        }
+        for title, (elapsed, peak) in results.items():
+            self.stdout.write(
+                f'{title}: {elapsed * 1000:.1f} мс,'
+                f' пик памяти {peak / 1024:.0f} КБ'
+            )
+        models_time = results['Модели'][0]
+        rows_time = results['Строки'][0]
+        if rows_time:
+            speedup = models_time / rows_time
+            self.stdout.write(self.style.SUCCESS(f'Ускорение: {speedup:.2f}x'))
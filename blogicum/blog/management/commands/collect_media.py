@@ -0,0 +1,33 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from blog.constants import MEDIA_GC_MIN_AGE
+from blog.images import collect_garbage
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет изображения публикаций и их уменьшенные копии,'
+        ' на которые не ссылается ни одна публикация.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=MEDIA_GC_MIN_AGE,
+            help='Не трогать файлы, изменённые за это число секунд.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только вывести файлы, которые были бы удалены.',
+        )
+
+    def handle(self, *args, min_age, dry_run, **options):
+        removed = collect_garbage(default_storage, min_age, dry_run)
+        for name in removed:
+            self.stdout.write(name)
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено файлов: {len(removed)}')
+        )
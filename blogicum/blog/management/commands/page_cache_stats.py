@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import is_process_local_cache
+from blog.page_cache import get_page_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает статистику кэша страниц для анонимных посетителей.'
+
+    def handle(self, *args, **options):
+        if is_process_local_cache():
+            self.stderr.write(
+                'Кэш хранится в памяти процесса: статистика веб-воркеров'
+                ' этой команде недоступна.'
+            )
+        stats = get_page_cache_stats()
+        self.stdout.write(
+            f'Попадания: {stats["hits"]}\n'
+            f'Промахи: {stats["misses"]}\n'
+            f'Инвалидации: {stats["invalidations"]}\n'
+            f'Доля попаданий: {stats["hit_rate"]:.1%}'
+        )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.constants import RECOUNT_BATCH_SIZE
+from blog.models import Post
+from blog.services import recount_comment_counts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает и исправляет счётчики комментариев публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECOUNT_BATCH_SIZE,
+            help='Количество публикаций, обрабатываемых за одну транзакцию.',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_pk = 0
+        repaired = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                repaired += recount_comment_counts(
+                    Post.objects.filter(pk__in=batch)
+                )
+            last_pk = batch[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {repaired}')
+        )
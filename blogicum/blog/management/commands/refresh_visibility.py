@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.services import refresh_posts_visibility
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает признак видимости публикаций в ленте.'
+
+    def handle(self, *args, **options):
+        changed = refresh_posts_visibility()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {changed}')
+        )
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump_post_tags, bump_tags, make_tag
+from blog.constants import RECOUNT_BATCH_SIZE
+from blog.models import Comment, Post
+
+INVALIDATION_FIELDS = {
+    Post: ('author_id', 'category_id'),
+    Comment: ('post_id',),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Заново формирует HTML текстов публикаций и комментариев; '
+        'запускайте после изменения правил форматирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECOUNT_BATCH_SIZE,
+            help='Количество записей, обрабатываемых за один запрос.',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        for model in (Post, Comment):
+            updated = self.rerender(model, batch_size)
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: обновлено {updated}'
+            ))
+
+    def invalidate(self, model, changed):
+        if model is Post:
+            bump_post_tags(changed)
+            return
+        bump_tags(*{
+            tag for comment in changed
+            for tag in (
+                make_tag('comment', comment.pk),
+                make_tag('comments', comment.post_id),
+            )
+        })
+
+    def rerender(self, model, batch_size):
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('id', 'text', 'text_html', *INVALIDATION_FIELDS[model])
+                [:batch_size]
+            )
+            if not batch:
+                return updated
+            changed = []
+            for obj in batch:
+                text_html = model.render_text(obj.text)
+                if obj.text_html != text_html:
+                    obj.text_html = text_html
+                    changed.append(obj)
+            if changed:
+                updated += model.objects.bulk_update(changed, ['text_html'])
+                self.invalidate(model, changed)
+            last_pk = batch[-1].pk
@@ -0,0 +1,59 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog.cache import is_process_local_cache
+from blog.constants import SCHEDULER_HORIZON, SCHEDULER_POLL_INTERVAL
+from blog.scheduler import PublicationScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Следит за отложенными публикациями и сообщает кэшам о моменте, '
+        'когда они появляются в ленте.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=SCHEDULER_POLL_INTERVAL,
+            help='Как часто (в секундах) искать новые отложенные публикации.',
+        )
+        parser.add_argument(
+            '--horizon',
+            type=int,
+            default=SCHEDULER_HORIZON,
+            help='На сколько секунд вперёд загружать расписание.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать наступившие публикации и завершиться.',
+        )
+
+    def handle(self, *args, interval, horizon, once, **options):
+        if is_process_local_cache():
+            raise CommandError(
+                'Кэш хранится в памяти процесса: веб-воркеры не увидят'
+                ' инвалидацию. Настройте общий кэш в CACHES.'
+            )
+        scheduler = PublicationScheduler(horizon=horizon)
+        period = timedelta(seconds=interval)
+        last_load = timezone.now() - period if once else None
+        next_load = timezone.now()
+        while True:
+            now = timezone.now()
+            if now >= next_load:
+                scheduler.load(now, since=last_load)
+                last_load = now
+                next_load = now + period
+            published = scheduler.publish_due(now)
+            if published:
+                self.stdout.write(f'Опубликовано: {len(published)}')
+            if once:
+                break
+            wake_at = min(scheduler.next_due() or next_load, next_load)
+            time.sleep(max(0, (wake_at - timezone.now()).total_seconds()))
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:44
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    last_pk = 0
+    while True:
+        posts = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .only('id', 'text')[:1000]
+        )
+        if not posts:
+            break
+        for post in posts:
+            post.excerpt = Truncator(
+                Truncator(post.text).words(10, truncate=' …')
+            ).chars(512)
+        Post.objects.bulk_update(posts, ['excerpt'])
+        last_pk = posts[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=512, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:45
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+
+
+def fill_text_html(apps, schema_editor):
+    for model_name in ('Post', 'Comment'):
+        model = apps.get_model('blog', model_name)
+        last_pk = 0
+        while True:
+            objects = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('id', 'text')[:1000]
+            )
+            if not objects:
+                break
+            for obj in objects:
+                obj.text_html = str(linebreaksbr(obj.text, autoescape=True))
+            model.objects.bulk_update(objects, ['text_html'])
+            last_pk = objects[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст (HTML)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст (HTML)'),
+        ),
+        migrations.RunPython(fill_text_html, migrations.RunPython.noop),
+    ]
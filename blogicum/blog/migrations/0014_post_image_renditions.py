@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_text_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Ширины уменьшенных копий изображения'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 01:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_image_dimensions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, help_text='Загрузите изображение для публикации', null=True, upload_to='posts/%Y/%m/%d/', verbose_name='Изображение'),
+        ),
+    ]
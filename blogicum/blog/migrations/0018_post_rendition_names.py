@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:12
+
+import os
+
+from django.db import migrations, models
+
+
+def store_rendition_names(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    last_pk = 0
+    while True:
+        posts = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .exclude(image_renditions=[])
+            .order_by('pk')
+            .only('id', 'image', 'image_renditions')[:1000]
+        )
+        if not posts:
+            break
+        for post in posts:
+            root, _ = os.path.splitext(post.image.name)
+            post.image_renditions = [
+                {
+                    'width': width,
+                    'jpeg': f'{root}.{width}w.jpeg',
+                    'webp': f'{root}.{width}w.webp',
+                }
+                for width in post.image_renditions
+            ]
+        Post.objects.bulk_update(posts, ['image_renditions'])
+        last_pk = posts[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_fts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Уменьшенные копии изображения'),
+        ),
+        migrations.RunPython(store_rendition_names, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,26 @@
 from django.contrib.auth import get_user_model
+from django.core.files.images import get_image_dimensions
 from django.db import models
+from django.template.defaultfilters import linebreaksbr
 from django.utils import timezone
+from django.utils.text import Truncator
 
-from .constants import COMMENT_TEXT_SNIPPET_LENGTH
+from .constants import (
+    COMMENT_TEXT_SNIPPET_LENGTH,
+    POST_EXCERPT_MAX_LENGTH,
+    POST_EXCERPT_WORDS,
+)
 
 
 User = get_user_model()
 
+IMAGE_METADATA_FIELDS = (
+    'image_width',
+    'image_height',
+    'image_placeholder',
+    'image_renditions',
+)
+
 
 class PublishedCreatedModel(models.Model):
     is_published = models.BooleanField(
@@ -18,10 +32,36 @@ class PublishedCreatedModel(models.Model):
         'Добавлено',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True
+    )
+
+    class Meta:
+        abstract = True
+
+
+class RenderedTextModel(models.Model):
+    text_html = models.TextField(
+        'Текст (HTML)',
+        blank=True,
+        editable=False
+    )
 
     class Meta:
         abstract = True
 
+    @staticmethod
+    def render_text(text):
+        return str(linebreaksbr(text, autoescape=True))
+
+    def save(self, *args, **kwargs):
+        self.text_html = self.render_text(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'text_html'}
+        super().save(*args, **kwargs)
+
 
 class Category(PublishedCreatedModel):
     title = models.CharField(
@@ -60,12 +100,18 @@ class Location(PublishedCreatedModel):
         return self.name
 
 
-class Post(PublishedCreatedModel):
+class Post(PublishedCreatedModel, RenderedTextModel):
     title = models.CharField(
         'Публикация',
         max_length=256
     )
     text = models.TextField('Текст')
+    excerpt = models.CharField(
+        'Анонс',
+        max_length=POST_EXCERPT_MAX_LENGTH,
+        blank=True,
+        editable=False
+    )
     pub_date = models.DateTimeField(
         'Дата и время публикации',
         default=timezone.now,
@@ -100,8 +146,46 @@ class Post(PublishedCreatedModel):
         upload_to='posts/%Y/%m/%d/',
         blank=True,
         null=True,
+        db_index=True,
         help_text='Загрузите изображение для публикации',
     )
+    image_width = models.PositiveIntegerField(
+        'Ширина изображения',
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    image_height = models.PositiveIntegerField(
+        'Высота изображения',
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    image_placeholder = models.TextField(
+        'Заглушка изображения',
+        blank=True,
+        editable=False,
+    )
+    image_renditions = models.JSONField(
+        'Уменьшенные копии изображения',
+        default=list,
+        blank=True,
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    is_visible = models.BooleanField(
+        'Видна в ленте',
+        default=False,
+        editable=False,
+        help_text=(
+            'Публикация и её категория опубликованы; '
+            'поддерживается автоматически.'
+        )
+    )
     # is_published = models.BooleanField(
     #     'Опубликовано',
     #     default=True,
@@ -112,12 +196,57 @@ class Post(PublishedCreatedModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                condition=models.Q(is_visible=True),
+                name='post_visible_pub_date_idx',
+            ),
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                name='post_category_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @staticmethod
+    def make_excerpt(text):
+        return Truncator(
+            Truncator(text).words(POST_EXCERPT_WORDS, truncate=' …')
+        ).chars(POST_EXCERPT_MAX_LENGTH)
 
-class Comment(models.Model):
+    def save(self, *args, **kwargs):
+        self.is_visible = self.is_published and (
+            Category.objects.filter(
+                pk=self.category_id, is_published=True
+            ).exists()
+        )
+        self.excerpt = self.make_excerpt(self.text)
+        self._image_uploaded = bool(self.image) and not self.image._committed
+        if self._image_uploaded or not self.image:
+            self.image_renditions = []
+            self.image_placeholder = ''
+            self.image_width, self.image_height = (
+                get_image_dimensions(self.image)
+                if self._image_uploaded else (None, None)
+            )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+            if 'text' in update_fields:
+                kwargs['update_fields'].add('excerpt')
+            if 'image' in update_fields:
+                kwargs['update_fields'].update(IMAGE_METADATA_FIELDS)
+        super().save(*args, **kwargs)
+
+
+class Comment(RenderedTextModel):
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -135,9 +264,19 @@ class Comment(models.Model):
         'Дата создания',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True
+    )
 
     class Meta:
         ordering = ['created_date']
+        indexes = [
+            models.Index(
+                fields=['post', 'created_date'],
+                name='comment_post_created_idx',
+            ),
+        ]
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
 
@@ -0,0 +1,193 @@
+import hashlib
+from functools import wraps
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.response import TemplateResponse
+from django.utils.cache import get_conditional_response
+
+from .cache import (
+    get_comment_tags,
+    get_post_tags,
+    get_tag_versions,
+    make_cache_key,
+    make_tag,
+)
+from .constants import (
+    ALL_FEEDS_CACHE_TAG,
+    COMMENT_COUNTS_CACHE_TAG,
+    CURSOR_QUERY_PARAM,
+    INDEX_FEED_CACHE_TAG,
+    PAGE_CACHE_PREFIX,
+    PAGE_CACHE_QUERY_PARAMS,
+    PAGE_CACHE_STATS_PREFIX,
+    PAGE_CACHE_TIMEOUT,
+    RELATED_CACHE_TAG,
+)
+from .models import Post
+from .services import (
+    decode_cursor,
+    get_next_visibility_change,
+    get_safe_cache_timeout,
+)
+
+PAGE_CACHE_STATS = ('hits', 'misses', 'invalidations')
+
+
+def count_page_cache_event(name):
+    key = f'{PAGE_CACHE_STATS_PREFIX}:{name}'
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_page_cache_stats():
+    stored = cache.get_many(
+        [f'{PAGE_CACHE_STATS_PREFIX}:{name}' for name in PAGE_CACHE_STATS]
+    )
+    stats = {
+        name: stored.get(f'{PAGE_CACHE_STATS_PREFIX}:{name}', 0)
+        for name in PAGE_CACHE_STATS
+    }
+    requests = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+    return stats
+
+
+def get_page_tags(context):
+    tags = set(context.get('page_cache_tags', ()))
+    for post in context.get('page_obj', ()):
+        tags.update(get_post_tags(post))
+    if context.get('post') is not None:
+        tags.update(get_post_tags(context['post']))
+    for comment in context.get('comments', ()):
+        tags.update(get_comment_tags(comment))
+    return tags
+
+
+def get_feed_page_tags(request, *args, **kwargs):
+    return (
+        INDEX_FEED_CACHE_TAG,
+        ALL_FEEDS_CACHE_TAG,
+        COMMENT_COUNTS_CACHE_TAG,
+        RELATED_CACHE_TAG,
+    )
+
+
+def get_post_page_tags(request, id):
+    return (
+        make_tag('post', id),
+        make_tag('comments', id),
+        ALL_FEEDS_CACHE_TAG,
+        RELATED_CACHE_TAG,
+    )
+
+
+def make_etag(request, tag_versions):
+    csrf_cookie = None
+    if request.user.is_authenticated:
+        get_token(request)
+        csrf_cookie = request.META['CSRF_COOKIE']
+    digest = hashlib.md5(
+        repr((
+            request.user.pk,
+            csrf_cookie,
+            get_next_visibility_change(),
+            sorted(tag_versions.items()),
+        )).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_page(get_tags):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            etag = make_etag(
+                request, get_tag_versions(get_tags(request, *args, **kwargs))
+            )
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                return response
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def has_canonical_query(request, context):
+    if not request.GET.keys() <= set(PAGE_CACHE_QUERY_PARAMS) or any(
+        len(values) > 1 for _, values in request.GET.lists()
+    ):
+        return False
+    page = request.GET.get('page')
+    if page is not None and page != str(
+        getattr(context.get('page_obj'), 'number', '')
+    ):
+        return False
+    cursor = request.GET.get(CURSOR_QUERY_PARAM)
+    if cursor is None:
+        return True
+    decoded = decode_cursor(cursor)
+    return decoded is not None and Post.objects.filter(
+        pk=decoded[2], pub_date=decoded[1]
+    ).exists()
+
+
+def cache_anonymous_page(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        key = make_cache_key(
+            PAGE_CACHE_PREFIX,
+            view.__name__,
+            args,
+            sorted(kwargs.items()),
+            [
+                (param, request.GET.getlist(param))
+                for param in PAGE_CACHE_QUERY_PARAMS
+            ],
+        )
+        entry = cache.get(key)
+        if entry is not None:
+            if get_tag_versions(entry['tags']) == entry['tags']:
+                count_page_cache_event('hits')
+                return HttpResponse(
+                    entry['content'], content_type=entry['content_type']
+                )
+            count_page_cache_event('invalidations')
+        count_page_cache_event('misses')
+
+        response = view(request, *args, **kwargs)
+        if (not isinstance(response, TemplateResponse)
+                or response.status_code != 200):
+            return response
+        tags = get_tag_versions(get_page_tags(response.context_data))
+        response.render()
+        timeout = get_safe_cache_timeout(PAGE_CACHE_TIMEOUT)
+        if timeout and has_canonical_query(request, response.context_data):
+            cache.set(
+                key,
+                {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'tags': tags,
+                },
+                timeout,
+            )
+        return response
+
+    return wrapper
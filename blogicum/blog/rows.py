@@ -0,0 +1,85 @@
+from .models import Post
+
+
+class Row:
+    __slots__ = ('id',)
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __repr__(self):
+        return f'<{type(self).__name__}: {self.id}>'
+
+
+class AuthorRow(Row):
+    __slots__ = ('id', 'username')
+
+    def __str__(self):
+        return self.username
+
+
+class CategoryRow(Row):
+    __slots__ = ('id', 'title', 'slug', 'is_published')
+
+    def __str__(self):
+        return self.title
+
+
+class LocationRow(Row):
+    __slots__ = ('id', 'name', 'is_published')
+
+    def __str__(self):
+        return self.name
+
+
+class ImageRow:
+    __slots__ = ('name',)
+
+    storage = Post._meta.get_field('image').storage
+
+    def __init__(self, name):
+        self.name = name
+
+    def __bool__(self):
+        return bool(self.name)
+
+    def __str__(self):
+        return self.name or ''
+
+    @property
+    def url(self):
+        return self.storage.url(self.name)
+
+
+class PostRow(Row):
+    __slots__ = (
+        'id',
+        'title',
+        'excerpt',
+        'pub_date',
+        'is_published',
+        'comment_count',
+        'author_id',
+        'category_id',
+        'location_id',
+        'image',
+        'image_width',
+        'image_height',
+        'image_placeholder',
+        'image_renditions',
+        'author',
+        'category',
+        'location',
+        'card_version',
+        'detail_url',
+        'author_url',
+        'category_url',
+    )
+
+    def __str__(self):
+        return self.title
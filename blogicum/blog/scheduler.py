@@ -0,0 +1,56 @@
+import heapq
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .constants import SCHEDULER_HORIZON
+from .models import Post
+from .signals import posts_became_visible
+
+
+class PublicationScheduler:
+    def __init__(self, horizon=SCHEDULER_HORIZON):
+        self.horizon = timedelta(seconds=horizon)
+        self._heap = []
+        self._scheduled = set()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def load(self, now=None, since=None):
+        now = now or timezone.now()
+        upcoming = Post.objects.filter(
+            is_visible=True,
+            pub_date__gt=since or now,
+            pub_date__lte=now + self.horizon,
+        ).values_list('pub_date', 'pk')
+        for pub_date, pk in upcoming:
+            if pk not in self._scheduled:
+                self._scheduled.add(pk)
+                heapq.heappush(self._heap, (pub_date, pk))
+
+    def next_due(self):
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        now = now or timezone.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, pk = heapq.heappop(self._heap)
+            self._scheduled.discard(pk)
+            due.append(pk)
+        return due
+
+    def publish_due(self, now=None):
+        now = now or timezone.now()
+        due = self.pop_due(now)
+        if not due:
+            return []
+        published = list(
+            Post.objects.filter(
+                pk__in=due, is_visible=True, pub_date__lte=now
+            ).values_list('pk', flat=True)
+        )
+        if published:
+            posts_became_visible.send(sender=Post, post_ids=published)
+        return published
@@ -0,0 +1,188 @@
+import re
+
+from django.db import connection
+from django.db.models import Case, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django.utils.text import smart_split, unescape_string_literal
+
+from .constants import SEARCH_TITLE_WEIGHT
+from .models import Post
+from .services import get_posts_queryset
+
+FTS_TABLE = 'blog_post_fts'
+
+SEARCH_TOKEN = re.compile(r'\w+')
+
+POST_INDEXED_FIELDS = ('title', 'text')
+
+FTS_TRIGGERS = {
+    'blog_post_fts_insert': f"""
+        CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END
+    """,
+    'blog_post_fts_delete': f"""
+        CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+        END
+    """,
+    'blog_post_fts_update': f"""
+        CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text
+        ON blog_post BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+            INSERT INTO {FTS_TABLE}(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END
+    """,
+}
+
+_search_index_cache = {}
+
+
+def _get_cache_key(connection):
+    return connection.alias, connection.settings_dict['NAME']
+
+
+def has_search_index(connection=connection):
+    key = _get_cache_key(connection)
+    if key not in _search_index_cache:
+        _search_index_cache[key] = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _search_index_cache[key]
+
+
+def get_missing_search_triggers(connection=connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+            " AND tbl_name = 'blog_post'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+    return [name for name in FTS_TRIGGERS if name not in existing]
+
+
+# SQLite выполняет большинство AlterField через пересоздание blog_post,
+# и триггеры старой таблицы удаляются вместе с ней.
+def restore_search_index(connection=connection):
+    _search_index_cache.pop(_get_cache_key(connection), None)
+    if not has_search_index(connection):
+        return []
+    missing = get_missing_search_triggers(connection)
+    if missing:
+        with connection.cursor() as cursor:
+            for name in missing:
+                cursor.execute(FTS_TRIGGERS[name])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+    return missing
+
+
+def make_match_query(query):
+    return ' '.join(
+        f'"{token}"*' for token in SEARCH_TOKEN.findall(query.lower())
+    )
+
+
+def get_search_terms(search_term):
+    for term in smart_split(search_term):
+        if term.startswith(('"', "'")) and term[0] == term[-1]:
+            term = unescape_string_literal(term)
+        yield term
+
+
+def get_matching_ids(match):
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        [match],
+    )
+
+
+class SearchResults:
+    def __init__(self, query):
+        self.match = make_match_query(query)
+        self.query = query
+
+    def _execute(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _where(self):
+        return (
+            f'FROM {FTS_TABLE} JOIN blog_post ON blog_post.id = '
+            f'{FTS_TABLE}.rowid WHERE {FTS_TABLE} MATCH %s'
+            ' AND blog_post.is_visible AND blog_post.pub_date <= %s',
+            [
+                self.match,
+                connection.ops.adapt_datetimefield_value(timezone.now()),
+            ],
+        )
+
+    def count(self):
+        if not self.match:
+            return 0
+        where, params = self._where()
+        return self._execute(f'SELECT COUNT(*) {where}', params)[0][0]
+
+    def _ranked_ids(self, offset, limit):
+        where, params = self._where()
+        rows = self._execute(
+            f'SELECT blog_post.id {where}'
+            f' ORDER BY bm25({FTS_TABLE}, %s, 1.0), blog_post.id DESC'
+            ' LIMIT %s OFFSET %s',
+            [*params, SEARCH_TITLE_WEIGHT, limit, offset],
+        )
+        return [pk for pk, in rows]
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return list(self[index:index + 1])[0]
+        if not self.match:
+            return Post.objects.none()
+        offset = index.start or 0
+        ids = self._ranked_ids(offset, index.stop - offset)
+        if not ids:
+            return Post.objects.none()
+        return get_posts_queryset().filter(pk__in=ids).order_by(
+            Case(
+                *(
+                    When(pk=pk, then=Value(position))
+                    for position, pk in enumerate(ids)
+                )
+            )
+        )
+
+    def __len__(self):
+        return self.count()
+
+
+class FallbackSearchResults(SearchResults):
+    def __init__(self, query):
+        super().__init__(query)
+        tokens = SEARCH_TOKEN.findall(query)
+        condition = Q()
+        for token in tokens:
+            condition &= Q(title__icontains=token) | Q(text__icontains=token)
+        self.queryset = (
+            get_posts_queryset().filter(condition) if tokens
+            else Post.objects.none()
+        )
+
+    def count(self):
+        return self.queryset.count()
+
+    def __getitem__(self, index):
+        return self.queryset[index]
+
+
+def search_posts(query):
+    if has_search_index():
+        return SearchResults(query)
+    return FallbackSearchResults(query)
@@ -1,38 +1,488 @@
-from django.core.paginator import Paginator
-from django.db.models import Count
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .cache import bump_post_tags, get_tag_versions, make_cache_key
+from .constants import (
+    ALL_FEEDS_CACHE_TAG,
+    COMMENT_COUNTS_CACHE_TAG,
+    COMMENTS_PER_PAGE,
+    CURSOR_NEXT,
+    CURSOR_PREVIOUS,
+    CURSOR_QUERY_PARAM,
+    FEED_AS_ROWS,
+    FEED_COUNT_CACHE_PREFIX,
+    FEED_COUNT_CACHE_TIMEOUT,
+    FEED_COUNT_ESTIMATE_LIMIT,
+    FEED_COUNT_STRATEGY,
+    FEEDS_CACHE_TAG,
+    NEXT_VISIBILITY_CHANGE_CACHE_PREFIX,
+    PAGE_RANGE_ON_EACH_SIDE,
+    PAGE_RANGE_ON_ENDS,
+    POST_ORDERING,
+    POST_ORDERING_TIEBREAKER,
+    POSTS_PER_PAGE,
+)
+from .models import Comment, Post
+from .rows import AuthorRow, CategoryRow, ImageRow, LocationRow, PostRow
 
-from .constants import POST_ORDERING, POSTS_PER_PAGE
-from .models import Post
+POST_ROW_FIELDS = (
+    'id',
+    'title',
+    'excerpt',
+    'pub_date',
+    'is_published',
+    'comment_count',
+    'author_id',
+    'category_id',
+    'location_id',
+    'image',
+    'image_width',
+    'image_height',
+    'image_placeholder',
+    'image_renditions',
+    'author__username',
+    'category__title',
+    'category__slug',
+    'category__is_published',
+    'location__name',
+    'location__is_published',
+)
 
 
 def get_posts_queryset(
     queryset=None,
     for_admin_or_author=False,
-    add_comment_count=True,
+    defer_text=True,
 ):
     if queryset is None:
         queryset = Post.objects.all()
 
     queryset = queryset.select_related('category', 'author', 'location')
 
+    if defer_text:
+        queryset = queryset.defer('text', 'text_html')
+
     if not for_admin_or_author:
         queryset = queryset.filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True
+            is_visible=True,
+            pub_date__lte=timezone.now()
         )
 
-    if add_comment_count:
-        queryset = queryset.annotate(comment_count=Count('comments'))
-
-    queryset = queryset.order_by(POST_ORDERING)
+    queryset = queryset.order_by(POST_ORDERING, POST_ORDERING_TIEBREAKER)
 
     return queryset
 
 
-def get_paginated_queryset(request, queryset, per_page=POSTS_PER_PAGE):
-    paginator = Paginator(queryset, per_page)
+def get_post_rows(queryset):
+    authors = {}
+    categories = {}
+    locations = {}
+    rows = []
+    for (
+        pk, title, excerpt, pub_date, is_published, comment_count,
+        author_id, category_id, location_id,
+        image, image_width, image_height, image_placeholder, image_renditions,
+        username, category_title, category_slug, category_is_published,
+        location_name, location_is_published,
+    ) in queryset.values_list(*POST_ROW_FIELDS):
+        row = PostRow(
+            pk, title, excerpt, pub_date, is_published, comment_count,
+            author_id, category_id, location_id,
+        )
+        row.image = ImageRow(image)
+        row.image_width = image_width
+        row.image_height = image_height
+        row.image_placeholder = image_placeholder
+        row.image_renditions = image_renditions
+        row.author = authors.get(author_id)
+        if row.author is None:
+            row.author = authors[author_id] = AuthorRow(author_id, username)
+        row.category = None
+        if category_id is not None:
+            row.category = categories.get(category_id)
+            if row.category is None:
+                row.category = categories[category_id] = CategoryRow(
+                    category_id,
+                    category_title,
+                    category_slug,
+                    category_is_published,
+                )
+        row.location = None
+        if location_id is not None:
+            row.location = locations.get(location_id)
+            if row.location is None:
+                row.location = locations[location_id] = LocationRow(
+                    location_id, location_name, location_is_published
+                )
+        rows.append(row)
+    return rows
+
+
+def is_post_visible_to(post, user):
+    return post.author_id == user.id or (
+        post.is_visible and post.pub_date <= timezone.now()
+    )
+
+
+def get_next_visibility_change(now=None):
+    now = now or timezone.now()
+    version = get_tag_versions([FEEDS_CACHE_TAG])[FEEDS_CACHE_TAG]
+    key = make_cache_key(NEXT_VISIBILITY_CHANGE_CACHE_PREFIX, version)
+    next_change = cache.get(key)
+    if next_change is None or (next_change and next_change <= now):
+        next_change = (
+            Post.objects.filter(is_visible=True, pub_date__gt=now)
+            .order_by('pub_date')
+            .values_list('pub_date', flat=True)
+            .first()
+        ) or False
+        timeout = (
+            (next_change - now).total_seconds() if next_change else None
+        )
+        cache.set(key, next_change, timeout)
+    return next_change or None
+
+
+def get_safe_cache_timeout(timeout, now=None):
+    now = now or timezone.now()
+    next_change = get_next_visibility_change(now)
+    if next_change is None:
+        return timeout
+    return max(0, min(timeout, (next_change - now).total_seconds()))
+
+
+def _update_posts(queryset, *tags, **values):
+    changed = list(queryset.only('author_id', 'category_id'))
+    if not changed:
+        return 0
+    updated = Post.objects.filter(
+        pk__in=[post.pk for post in changed]
+    ).update(updated_at=timezone.now(), **values)
+    bump_post_tags(changed, *tags)
+    return updated
+
+
+def set_category_posts_visibility(category, visible=None):
+    if visible is None:
+        visible = category.is_published
+    posts = Post.objects.filter(category=category)
+    if visible:
+        posts = posts.filter(is_published=True, is_visible=False)
+    else:
+        posts = posts.filter(is_visible=True)
+    return _update_posts(
+        posts, FEEDS_CACHE_TAG, ALL_FEEDS_CACHE_TAG, is_visible=visible
+    )
+
+
+def refresh_posts_visibility(queryset=None):
+    if queryset is None:
+        queryset = Post.objects.all()
+    visible = Q(is_published=True, category__is_published=True)
+    tags = (FEEDS_CACHE_TAG, ALL_FEEDS_CACHE_TAG)
+    shown = _update_posts(
+        queryset.filter(visible, is_visible=False), *tags, is_visible=True
+    )
+    hidden = _update_posts(
+        queryset.filter(is_visible=True).exclude(visible), *tags,
+        is_visible=False,
+    )
+    return shown + hidden
+
+
+def recount_comment_counts(queryset):
+    actual_count = Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0,
+    )
+    return _update_posts(
+        queryset.exclude(comment_count=actual_count),
+        COMMENT_COUNTS_CACHE_TAG,
+        comment_count=actual_count,
+    )
+
+
+def encode_cursor(direction, value, pk):
+    payload = json.dumps([direction, value.isoformat(), pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, value, pk = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        value = datetime.fromisoformat(value)
+    except (binascii.Error, TypeError, ValueError, UnicodeDecodeError):
+        return None
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or not isinstance(
+        pk, int
+    ):
+        return None
+    return direction, value, pk
+
+
+class KeysetPage:
+    is_keyset = True
+    paginator = None
+
+    def __init__(self, object_list, has_next, has_previous,
+                 key_field='pub_date'):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.key_field = key_field
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not (self._has_next and self.object_list):
+            return None
+        last = self.object_list[-1]
+        return encode_cursor(
+            CURSOR_NEXT, getattr(last, self.key_field), last.pk
+        )
+
+    @property
+    def previous_cursor(self):
+        if not (self._has_previous and self.object_list):
+            return None
+        first = self.object_list[0]
+        return encode_cursor(
+            CURSOR_PREVIOUS, getattr(first, self.key_field), first.pk
+        )
+
+
+def _seek_filter(key_field, value, pk, greater):
+    lookup = 'gt' if greater else 'lt'
+    return Q(**{f'{key_field}__{lookup}': value}) | Q(
+        **{key_field: value, f'pk__{lookup}': pk}
+    )
+
+
+def get_keyset_page(queryset, cursor, per_page=POSTS_PER_PAGE,
+                    key_field='pub_date', descending=True, hydrate=list):
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded is None:
+        rows = hydrate(queryset[:per_page + 1])
+        return KeysetPage(
+            rows[:per_page], len(rows) > per_page, False, key_field
+        )
+
+    direction, value, pk = decoded
+    if direction == CURSOR_NEXT:
+        rows = hydrate(
+            queryset.filter(
+                _seek_filter(key_field, value, pk, greater=not descending)
+            )[:per_page + 1]
+        )
+        return KeysetPage(
+            rows[:per_page], len(rows) > per_page, True, key_field
+        )
+
+    rows = hydrate(
+        queryset.filter(
+            _seek_filter(key_field, value, pk, greater=descending)
+        ).reverse()[:per_page + 1]
+    )
+    return KeysetPage(
+        rows[:per_page][::-1], True, len(rows) > per_page, key_field
+    )
+
+
+def get_comments_page(post, cursor=None, per_page=COMMENTS_PER_PAGE):
+    comments = post.comments.select_related('author').order_by(
+        'created_date', 'id'
+    )
+    return get_keyset_page(
+        comments,
+        cursor,
+        per_page,
+        key_field='created_date',
+        descending=False,
+    )
+
+
+def exact_count(queryset, count_key=None):
+    return queryset.count()
+
+
+def cached_count(queryset, count_key=None):
+    if count_key is None:
+        return exact_count(queryset)
+    version = get_tag_versions([FEEDS_CACHE_TAG])[FEEDS_CACHE_TAG]
+    key = make_cache_key(FEED_COUNT_CACHE_PREFIX, count_key, version)
+    count = cache.get(key)
+    if count is None:
+        count = exact_count(queryset)
+        timeout = get_safe_cache_timeout(FEED_COUNT_CACHE_TIMEOUT)
+        if timeout:
+            cache.set(key, count, timeout)
+    return count
+
+
+class EstimatedCount(int):
+    """Lower bound of a count that stopped at FEED_COUNT_ESTIMATE_LIMIT."""
+
+    def __str__(self):
+        return f'{int(self)}+'
+
+
+def estimated_count(queryset, count_key=None):
+    count = queryset.order_by()[:FEED_COUNT_ESTIMATE_LIMIT + 1].count()
+    if count > FEED_COUNT_ESTIMATE_LIMIT:
+        return EstimatedCount(FEED_COUNT_ESTIMATE_LIMIT)
+    return count
+
+
+COUNT_STRATEGIES = {
+    'exact': exact_count,
+    'cached': cached_count,
+    'estimated': estimated_count,
+}
+
+
+class FeedPage(Page):
+    has_more = None
+
+    def has_next(self):
+        if self.has_more is None:
+            return super().has_next()
+        return self.has_more
+
+    def end_index(self):
+        if self.has_more is None:
+            return super().end_index()
+        return self.start_index() + len(self) - 1
+
+
+class FeedPaginator(Paginator):
+    def __init__(self, object_list, per_page, count_strategy=None,
+                 count_key=None, hydrate=list, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count_strategy is None or isinstance(count_strategy, str):
+            count_strategy = COUNT_STRATEGIES[
+                count_strategy or FEED_COUNT_STRATEGY
+            ]
+        self.count_strategy = count_strategy
+        self.count_key = count_key
+        self.hydrate = hydrate
+
+    @cached_property
+    def count(self):
+        return self.count_strategy(self.object_list, self.count_key)
+
+    @property
+    def is_estimated(self):
+        return isinstance(self.count, EstimatedCount)
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.is_estimated or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if not self.is_estimated:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = self.hydrate(
+            self.object_list[bottom:bottom + self.per_page + 1]
+        )
+        if not rows:
+            raise EmptyPage(self.error_messages['no_results'])
+        page = FeedPage(rows[:self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, object_list, number, paginator):
+        return FeedPage(self.hydrate(object_list), number, paginator)
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3, on_ends=2):
+        if not self.is_estimated:
+            yield from super().get_elided_page_range(
+                number, on_each_side=on_each_side, on_ends=on_ends
+            )
+            return
+        number = self.validate_number(number)
+        if number > (1 + on_each_side + on_ends) + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        yield from range(
+            number + 1, min(number + on_each_side, self.num_pages) + 1
+        )
+        yield self.ELLIPSIS
+
+
+def get_paginated_queryset(
+    request,
+    queryset,
+    per_page=POSTS_PER_PAGE,
+    count_strategy=None,
+    count_key=None,
+    as_rows=FEED_AS_ROWS,
+    keyset=True,
+):
+    hydrate = get_post_rows if as_rows else list
+    cursor = request.GET.get(CURSOR_QUERY_PARAM) if keyset else None
+    if cursor is not None:
+        return get_keyset_page(queryset, cursor, per_page, hydrate=hydrate)
+
+    paginator = FeedPaginator(
+        queryset,
+        per_page,
+        count_strategy=count_strategy,
+        count_key=count_key,
+        hydrate=hydrate,
+    )
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    page_obj.elided_page_range = list(
+        paginator.get_elided_page_range(
+            page_obj.number,
+            on_each_side=PAGE_RANGE_ON_EACH_SIDE,
+            on_ends=PAGE_RANGE_ON_ENDS,
+        )
+    )
+    if keyset and page_obj.has_next():
+        last = page_obj[-1]
+        page_obj.next_cursor = encode_cursor(
+            CURSOR_NEXT, last.pub_date, last.pk
+        )
     return page_obj
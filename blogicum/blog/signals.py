@@ -0,0 +1,248 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db import connections
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from . import typeahead
+from .cache import bump_tags, get_post_feed_tags, make_tag
+from .constants import (
+    COMMENT_COUNTS_CACHE_TAG,
+    FEEDS_CACHE_TAG,
+    RELATED_CACHE_TAG,
+)
+from .images import schedule_renditions
+from .models import Category, Comment, Location, Post
+from .search import restore_search_index
+from .services import (
+    refresh_posts_visibility,
+    set_category_posts_visibility,
+)
+
+User = get_user_model()
+
+posts_became_visible = Signal()
+
+
+def _change_comment_count(post_id, delta):
+    queryset = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        queryset = queryset.filter(comment_count__gte=-delta)
+    queryset.update(
+        comment_count=F('comment_count') + delta, updated_at=timezone.now()
+    )
+    bump_tags(make_tag('post', post_id), COMMENT_COUNTS_CACHE_TAG)
+
+
+def _deleted_with_post(comment, origin):
+    if isinstance(origin, Post):
+        return origin.pk == comment.post_id
+    return getattr(origin, 'model', None) is Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(posts_became_visible)
+def invalidate_feed_counts(sender, **kwargs):
+    bump_tags(FEEDS_CACHE_TAG)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    tags = {make_tag('post', instance.pk), *get_post_feed_tags(instance)}
+    previous = getattr(instance, '_previous_state', None)
+    if previous is not None:
+        tags.update(get_post_feed_tags(previous))
+    bump_tags(*tags)
+
+
+@receiver(posts_became_visible)
+def invalidate_scheduled_post_feeds(sender, post_ids, **kwargs):
+    tags = set()
+    for post in Post.objects.filter(pk__in=post_ids).only(
+        'author_id', 'category_id'
+    ):
+        tags.update(get_post_feed_tags(post))
+    bump_tags(*tags)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, instance, created=False, **kwargs):
+    bump_tags(
+        make_tag('category', instance.pk),
+        make_tag('feed:category', instance.pk),
+        *(() if created else (RELATED_CACHE_TAG,)),
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, created=False, **kwargs):
+    bump_tags(
+        make_tag('location', instance.pk),
+        *(() if created else (RELATED_CACHE_TAG,)),
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_pages(sender, instance, created=False,
+                          update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_tags(
+        make_tag('user', instance.pk),
+        make_tag('feed:profile', instance.pk),
+        *(() if created else (RELATED_CACHE_TAG,)),
+    )
+
+
+@receiver(post_save, sender=Post)
+def sync_loaded_post_visibility(sender, instance, raw=False, **kwargs):
+    if raw:
+        refresh_posts_visibility(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_post_state(sender, instance, raw=False, **kwargs):
+    instance._previous_state = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_state = (
+        Post.objects.filter(pk=instance.pk)
+        .only('author_id', 'category_id')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_image_renditions(sender, instance, raw=False, **kwargs):
+    if not raw and getattr(instance, '_image_uploaded', False):
+        schedule_renditions(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def sync_category_posts_visibility(sender, instance, created, raw=False,
+                                   **kwargs):
+    if not raw and not created:
+        set_category_posts_visibility(instance)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    set_category_posts_visibility(instance, visible=False)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw=False, **kwargs):
+    instance._previous_post_id = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_post_id = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list('post_id', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if created:
+        _change_comment_count(instance.post_id, 1)
+    elif previous_post_id and previous_post_id != instance.post_id:
+        _change_comment_count(previous_post_id, -1)
+        _change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    bump_tags(
+        make_tag('comment', instance.pk),
+        make_tag('comments', instance.post_id),
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, origin=None, **kwargs):
+    if _deleted_with_post(instance, origin):
+        return
+    _change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+def update_post_suggestions(sender, instance, using, **kwargs):
+    if instance.is_visible:
+        typeahead.schedule_update(
+            typeahead.POST,
+            instance.pk,
+            instance.title,
+            instance.pk,
+            instance.pub_date,
+            using=using,
+        )
+    else:
+        typeahead.schedule_remove(typeahead.POST, instance.pk, using=using)
+
+
+@receiver(post_save, sender=Category)
+def update_category_suggestions(sender, instance, created, using, **kwargs):
+    if instance.is_published:
+        typeahead.schedule_update(
+            typeahead.CATEGORY, instance.pk, instance.title, instance.slug,
+            using=using,
+        )
+    else:
+        typeahead.schedule_remove(typeahead.CATEGORY, instance.pk, using=using)
+    if not created:
+        typeahead.schedule_invalidate(using=using)
+
+
+@receiver(post_save, sender=User)
+def update_user_suggestions(sender, instance, using, update_fields=None,
+                            **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    if instance.is_active:
+        typeahead.schedule_update(
+            typeahead.USER, instance.pk, instance.username, instance.username,
+            using=using,
+        )
+    else:
+        typeahead.schedule_remove(typeahead.USER, instance.pk, using=using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_suggestions(sender, instance, using, **kwargs):
+    typeahead.schedule_remove(typeahead.POST, instance.pk, using=using)
+
+
+@receiver(post_delete, sender=Category)
+def remove_category_suggestions(sender, instance, using, **kwargs):
+    typeahead.schedule_remove(typeahead.CATEGORY, instance.pk, using=using)
+    typeahead.schedule_invalidate(using=using)
+
+
+@receiver(post_delete, sender=User)
+def remove_user_suggestions(sender, instance, using, **kwargs):
+    typeahead.schedule_remove(typeahead.USER, instance.pk, using=using)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.label == 'blog':
+        restore_search_index(connections[using])
@@ -0,0 +1,16 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    $(document).on('change', '.admin-autocomplete-filter', function() {
+        const value = this.value;
+        if (!value) {
+            window.location.search = this.dataset.clearUrl;
+            return;
+        }
+        const params = new URLSearchParams(window.location.search);
+        params.set(this.dataset.lookupKwarg, value);
+        params.delete('p');
+        window.location.search = params.toString();
+    });
+}
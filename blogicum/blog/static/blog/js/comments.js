@@ -0,0 +1,11 @@
+'use strict';
+document.addEventListener('click', function (event) {
+  const link = event.target.closest('[data-comments-fragment]');
+  if (!link) {
+    return;
+  }
+  event.preventDefault();
+  fetch(link.dataset.commentsFragment)
+    .then(function (response) { return response.text(); })
+    .then(function (html) { link.outerHTML = html; });
+});
@@ -0,0 +1,21 @@
+'use strict';
+const searchInput = document.querySelector('[data-suggest-url]');
+const suggestionList = document.getElementById('search-suggestions');
+let suggestionRequest = null;
+searchInput.addEventListener('input', function () {
+  if (suggestionRequest) {
+    suggestionRequest.abort();
+  }
+  suggestionRequest = new AbortController();
+  const url = searchInput.dataset.suggestUrl + '?q=' + encodeURIComponent(searchInput.value);
+  fetch(url, {signal: suggestionRequest.signal})
+    .then(function (response) { return response.json(); })
+    .then(function (data) {
+      suggestionList.replaceChildren(...data.results.map(function (item) {
+        const option = document.createElement('option');
+        option.value = item.label;
+        return option;
+      }));
+    })
+    .catch(function () {});
+});
@@ -0,0 +1,51 @@
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+CONTENT_ADDRESSED_NAME = re.compile(
+    r'^[^/]+/(?P<first>[0-9a-f]{2})/(?P<second>[0-9a-f]{2})/'
+    r'(?P=first)(?P=second)[0-9a-f]{60}(\.[0-9a-z]+)?$'
+)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    hash_algorithm = 'sha256'
+
+    def is_content_addressed(self, name):
+        return bool(CONTENT_ADDRESSED_NAME.search(name.replace('\\', '/')))
+
+    def hash_content(self, content):
+        digest = hashlib.new(self.hash_algorithm)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return digest.hexdigest()
+
+    def get_hashed_name(self, name, digest):
+        directory = os.path.dirname(name).replace('\\', '/').split('/')[0]
+        _, extension = os.path.splitext(name)
+        return '/'.join(
+            part for part in (
+                directory,
+                digest[:2],
+                digest[2:4],
+                f'{digest}{extension.lower()}',
+            ) if part
+        )
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.get_hashed_name(name, self.hash_content(content))
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
@@ -0,0 +1,51 @@
+from django import template
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.urls import get_script_prefix
+from django.utils import timezone, translation
+from django.utils.safestring import mark_safe
+
+from blog.cache import make_cache_key, prefetch_card_versions
+from blog.constants import POST_CARD_CACHE_PREFIX, POST_CARD_CACHE_TIMEOUT
+from blog.images import get_srcset
+from blog.links import add_card_urls, fast_reverse
+
+register = template.Library()
+
+
+@register.simple_tag
+def prefetch_post_cards(posts):
+    prefetch_card_versions(posts)
+    add_card_urls(posts)
+    return ''
+
+
+@register.simple_tag
+def post_card(post):
+    if not hasattr(post, 'card_version'):
+        prefetch_card_versions([post])
+    if not hasattr(post, 'detail_url'):
+        add_card_urls([post])
+    key = make_cache_key(
+        POST_CARD_CACHE_PREFIX,
+        post.pk,
+        post.card_version,
+        translation.get_language(),
+        timezone.get_current_timezone_name(),
+        get_script_prefix(),
+    )
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string('includes/post_card.html', {'post': post})
+        cache.set(key, html, POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+@register.simple_tag
+def fast_url(viewname, arg):
+    return fast_reverse(viewname, arg)
+
+
+@register.simple_tag
+def image_srcset(post, extension):
+    return get_srcset(post.image, post.image_renditions, extension)
@@ -0,0 +1,228 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from functools import partial
+from heapq import merge
+
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .constants import (
+    TYPEAHEAD_LIMIT,
+    TYPEAHEAD_REBUILD_INTERVAL,
+    TYPEAHEAD_RECENT_LIMIT,
+)
+from .links import build_url, get_url_templates
+from .models import Category, Post
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+POST = 'post'
+CATEGORY = 'category'
+USER = 'user'
+
+KIND_URLS = {
+    POST: 'blog:post_detail',
+    CATEGORY: 'blog:category_posts',
+    USER: 'blog:profile',
+}
+
+
+def normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+def get_tokens(normalized):
+    return frozenset(normalized.split(' '))
+
+
+def _scan(keys, token):
+    position = bisect_left(keys, (token,))
+    while position < len(keys) and keys[position][0].startswith(token):
+        yield keys[position]
+        position += 1
+
+
+def _matches(item, token, prefix, now):
+    if item is None or token not in item['tokens']:
+        return False
+    if ' ' in prefix and f' {prefix}' not in f' {item["normalized"]}':
+        return False
+    return not item['available_from'] or item['available_from'] <= now
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.keys = []
+        self.recent = []
+        self.items = {}
+        self.pending = None
+        self.built_at = None
+        self.rebuilding = False
+        self.expired = False
+        self.lock = threading.Lock()
+
+    def _make_item(self, label, url_arg, available_from=None):
+        normalized = normalize(label)
+        return {
+            'label': label,
+            'normalized': normalized,
+            'url_arg': url_arg,
+            'available_from': available_from,
+            'tokens': get_tokens(normalized),
+        }
+
+    def _apply(self, item_key, item):
+        # suggest() обходит списки без блокировки, поэтому recent
+        # не меняется на месте, а заменяется новой копией.
+        recent = [entry for entry in self.recent if entry[1] != item_key]
+        if item is None:
+            self.items.pop(item_key, None)
+        else:
+            recent.extend((token, item_key) for token in item['tokens'])
+            recent.sort()
+            self.items[item_key] = item
+        self.recent = recent
+
+    def update(self, kind, pk, label=None, url_arg=None, available_from=None):
+        item_key = (kind, pk)
+        item = (
+            self._make_item(label, url_arg, available_from) if label
+            else None
+        )
+        with self.lock:
+            self._apply(item_key, item)
+            if self.pending is not None:
+                self.pending.append((item_key, item))
+            if len(self.recent) > TYPEAHEAD_RECENT_LIMIT:
+                self.expired = True
+
+    def remove(self, kind, pk):
+        self.update(kind, pk)
+
+    def invalidate(self):
+        self.expired = True
+
+    def is_stale(self):
+        return (
+            self.built_at is None
+            or self.expired
+            or time.monotonic() - self.built_at > TYPEAHEAD_REBUILD_INTERVAL
+        )
+
+    def _load(self):
+        items = {}
+        for pk, title, pub_date in Post.objects.filter(
+            is_visible=True
+        ).values_list('pk', 'title', 'pub_date').iterator():
+            items[POST, pk] = self._make_item(title, pk, pub_date)
+        for pk, title, slug in Category.objects.filter(
+            is_published=True
+        ).values_list('pk', 'title', 'slug').iterator():
+            items[CATEGORY, pk] = self._make_item(title, slug)
+        for pk, username in User.objects.filter(
+            is_active=True
+        ).values_list('pk', 'username').iterator():
+            items[USER, pk] = self._make_item(username, username)
+        return items
+
+    def rebuild(self):
+        with self.lock:
+            self.pending = []
+        try:
+            items = self._load()
+            keys = sorted(
+                (token, item_key)
+                for item_key, item in items.items()
+                for token in item['tokens']
+            )
+        except BaseException:
+            with self.lock:
+                self.pending = None
+            raise
+        with self.lock:
+            self.keys = keys
+            self.recent = []
+            self.items = items
+            for item_key, item in self.pending:
+                self._apply(item_key, item)
+            self.pending = None
+            self.built_at = time.monotonic()
+            self.expired = False
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception('Не удалось перестроить индекс подсказок')
+        finally:
+            self.rebuilding = False
+            connections.close_all()
+
+    def refresh(self):
+        if not self.is_stale():
+            return
+        with self.lock:
+            if self.rebuilding:
+                return
+            self.rebuilding = True
+        threading.Thread(
+            target=self._rebuild_in_background, daemon=True
+        ).start()
+
+    def suggest(self, query, limit=TYPEAHEAD_LIMIT):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        now = timezone.now()
+        url_templates = get_url_templates()
+        results = []
+        seen = set()
+        token = prefix.split(' ')[0]
+        keys, recent, items = self.keys, self.recent, self.items
+        for key, item_key in merge(
+            _scan(keys, token), _scan(recent, token)
+        ):
+            if len(results) >= limit:
+                break
+            item = items.get(item_key)
+            if item_key in seen or not _matches(item, key, prefix, now):
+                continue
+            seen.add(item_key)
+            kind = item_key[0]
+            results.append({
+                'type': kind,
+                'label': item['label'],
+                'url': build_url(
+                    url_templates[KIND_URLS[kind]], item['url_arg']
+                ),
+            })
+        return results
+
+
+index = PrefixIndex()
+
+
+def suggest(query, limit=TYPEAHEAD_LIMIT):
+    index.refresh()
+    return index.suggest(query, limit)
+
+
+def schedule_update(kind, pk, label=None, url_arg=None, available_from=None,
+                    using=None):
+    transaction.on_commit(
+        partial(index.update, kind, pk, label, url_arg, available_from),
+        using=using,
+    )
+
+
+def schedule_remove(kind, pk, using=None):
+    transaction.on_commit(partial(index.remove, kind, pk), using=using)
+
+
+def schedule_invalidate(using=None):
+    transaction.on_commit(index.invalidate, using=using)
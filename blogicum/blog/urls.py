@@ -10,10 +10,15 @@ urlpatterns = [
     path('category/<slug:category_slug>/',
          views.category_posts, name='category_posts'),
     path('posts/create/', views.create_post, name='create_post'),
+    path('search/', views.search, name='search'),
+    path('search/suggest/', views.search_suggestions,
+         name='search_suggestions'),
     path('profile/edit/', views.user_profile_edit, name='edit_profile'),
     path('profile/<str:username>/', views.user_profile, name='profile'),
     path('posts/<int:id>/edit/', views.edit_post, name='edit_post'),
     path('posts/<int:id>/comment/', views.add_comment, name='add_comment'),
+    path('posts/<int:id>/comments/',
+         views.post_comments, name='post_comments'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>/',
          views.edit_comment, name='edit_comment'),
     path('posts/<int:id>/delete/', views.delete_post, name='delete_post'),
@@ -1,46 +1,68 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.db import transaction
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
-
+from django.template.response import TemplateResponse
+
+from .cache import make_tag
+from .constants import (
+    ALL_FEEDS_CACHE_TAG,
+    INDEX_FEED_CACHE_TAG,
+    SEARCH_QUERY_MAX_LENGTH,
+    SEARCH_QUERY_PARAM,
+    TYPEAHEAD_MAX_LENGTH,
+)
 from .forms import CommentForm, PostForm, ProfileEditForm
 from .models import Category, Comment, Post
-from .services import get_paginated_queryset, get_posts_queryset
+from .page_cache import (
+    cache_anonymous_page,
+    conditional_page,
+    get_feed_page_tags,
+    get_post_page_tags,
+)
+from .search import search_posts
+from .typeahead import suggest
+from .services import (
+    get_comments_page,
+    get_paginated_queryset,
+    get_posts_queryset,
+    is_post_visible_to,
+)
 
 User = get_user_model()
 
 
+@conditional_page(get_feed_page_tags)
+@cache_anonymous_page
 def index(request):
     posts = get_posts_queryset()
 
-    page_obj = get_paginated_queryset(request, posts)
+    page_obj = get_paginated_queryset(request, posts, count_key=('index',))
 
     context = {
         'page_obj': page_obj,
         'paginator': page_obj.paginator,
+        'page_cache_tags': (INDEX_FEED_CACHE_TAG, ALL_FEEDS_CACHE_TAG),
     }
-    return render(request, 'blog/index.html', context)
-
+    return TemplateResponse(request, 'blog/index.html', context)
 
-def post_detail(request, id):
-    queryset = get_posts_queryset(
-        for_admin_or_author=True,
-        add_comment_count=True,
-    )
 
+def get_post_for_user(request, id):
     post = get_object_or_404(
-        queryset.filter(
-            Q(author_id=request.user.id) | Q(
-                category__is_published=True,
-                is_published=True,
-                pub_date__lt=timezone.now()
-            ),
-            id=id
-        )
+        get_posts_queryset(for_admin_or_author=True, defer_text=False),
+        id=id,
     )
+    if not is_post_visible_to(post, request.user):
+        raise Http404
+    return post
+
+
+@conditional_page(get_post_page_tags)
+def post_detail(request, id):
+    post = get_post_for_user(request, id)
 
-    comments = post.comments.select_related('author').all()
+    comments = get_comments_page(post, request.GET.get('comments_cursor'))
     form = None
     if request.user.is_authenticated:
         form = CommentForm()
@@ -49,10 +71,26 @@ def post_detail(request, id):
         'post': post,
         'comments': comments,
         'form': form,
+        'page_cache_tags': (make_tag('comments', post.pk),),
+    }
+    return TemplateResponse(request, 'blog/detail.html', context)
+
+
+@conditional_page(get_post_page_tags)
+def post_comments(request, id):
+    post = get_post_for_user(request, id)
+
+    context = {
+        'post': post,
+        'comments': get_comments_page(post, request.GET.get('cursor')),
+        'is_fragment': True,
+        'page_cache_tags': (make_tag('comments', post.pk),),
     }
-    return render(request, 'blog/detail.html', context)
+    return TemplateResponse(request, 'includes/comments.html', context)
 
 
+@conditional_page(get_feed_page_tags)
+@cache_anonymous_page
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
@@ -62,37 +100,81 @@ def category_posts(request, category_slug):
 
     initial_category_posts = category.posts.all()
 
-    posts_queryset = get_posts_queryset(
-        queryset=initial_category_posts,
-        add_comment_count=True,
-    )
+    posts_queryset = get_posts_queryset(queryset=initial_category_posts)
 
-    page_obj = get_paginated_queryset(request, posts_queryset)
+    page_obj = get_paginated_queryset(
+        request,
+        posts_queryset,
+        count_key=('category', category.pk),
+    )
 
     context = {
         'category': category,
         'page_obj': page_obj,
         'paginator': page_obj.paginator,
+        'page_cache_tags': (
+            make_tag('category', category.pk),
+            make_tag('feed:category', category.pk),
+            ALL_FEEDS_CACHE_TAG,
+        ),
     }
-    return render(request, 'blog/category.html', context)
+    return TemplateResponse(request, 'blog/category.html', context)
 
 
+@conditional_page(get_feed_page_tags)
+@cache_anonymous_page
 def user_profile(request, username):
     profile_user = get_object_or_404(User, username=username)
     posts_queryset = profile_user.posts.all()
 
+    is_author = request.user == profile_user
     posts = get_posts_queryset(
         queryset=posts_queryset,
-        for_admin_or_author=request.user == profile_user,
+        for_admin_or_author=is_author,
     )
 
-    page_obj = get_paginated_queryset(request, posts)
+    page_obj = get_paginated_queryset(
+        request,
+        posts,
+        count_key=('profile', profile_user.pk, is_author),
+    )
 
     context = {
         'profile': profile_user,
         'page_obj': page_obj,
+        'page_cache_tags': (
+            make_tag('user', profile_user.pk),
+            make_tag('feed:profile', profile_user.pk),
+            ALL_FEEDS_CACHE_TAG,
+        ),
     }
-    return render(request, 'blog/profile.html', context)
+    return TemplateResponse(request, 'blog/profile.html', context)
+
+
+@conditional_page(get_feed_page_tags)
+@cache_anonymous_page
+def search(request):
+    query = request.GET.get(SEARCH_QUERY_PARAM, '').strip()
+    query = query[:SEARCH_QUERY_MAX_LENGTH]
+
+    page_obj = get_paginated_queryset(
+        request,
+        search_posts(query),
+        count_strategy='exact',
+        keyset=False,
+    )
+
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'page_cache_tags': (INDEX_FEED_CACHE_TAG, ALL_FEEDS_CACHE_TAG),
+    }
+    return TemplateResponse(request, 'blog/search.html', context)
+
+
+def search_suggestions(request):
+    query = request.GET.get(SEARCH_QUERY_PARAM, '')[:TYPEAHEAD_MAX_LENGTH]
+    return JsonResponse({'results': suggest(query)})
 
 
 @login_required
@@ -153,7 +235,8 @@ def add_comment(request, id):
         comment = form.save(commit=False)
         comment.post = post
         comment.author = request.user
-        comment.save()
+        with transaction.atomic():
+            comment.save()
 
     return redirect('blog:post_detail', id=id)
 
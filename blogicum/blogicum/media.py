@@ -0,0 +1,191 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from blog.storage import CONTENT_ADDRESSED_NAME
+
+MEDIA_CHUNK_SIZE = 64 * 1024
+
+MEDIA_MAX_AGE = 60 * 60
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+HASHED_STATIC_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def get_byte_range(header, size):
+    match = RANGE_HEADER.match(header.strip())
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = min(int(end), size)
+        if not length:
+            return False
+        return size - length, size - 1
+    start = int(start)
+    if end and int(end) < start:
+        return None
+    if start >= size:
+        return False
+    return start, min(int(end), size - 1) if end else size - 1
+
+
+def read_range(path, start, end):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(MEDIA_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _offloaded_response(path, full_path, accel_prefix):
+    response = HttpResponse()
+    if settings.MEDIA_SERVE_MODE == 'x-sendfile':
+        response['X-Sendfile'] = full_path
+    else:
+        response['X-Accel-Redirect'] = accel_prefix + quote(path)
+    return response
+
+
+def get_accepted_encodings(header):
+    accepted = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def _find_precompressed(request, full_path):
+    accepted = get_accepted_encodings(
+        request.headers.get('Accept-Encoding', '')
+    )
+    candidates = sorted(
+        PRECOMPRESSED_ENCODINGS,
+        key=lambda item: -accepted.get(item[0], accepted.get('*', 0.0)),
+    )
+    for encoding, suffix in candidates:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > 0 and os.path.isfile(full_path + suffix):
+            return full_path + suffix, encoding
+    return full_path, None
+
+
+def _file_response(request, full_path, size, etag):
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if 'Range' in request.headers and if_range in (None, etag):
+        byte_range = get_byte_range(request.headers['Range'], size)
+    if byte_range is False or (byte_range and size == 0):
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is None:
+        return FileResponse(open(full_path, 'rb'))
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        read_range(full_path, start, end), status=206
+    )
+    response['Content-Length'] = end - start + 1
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def serve_file(request, path, document_root, accel_prefix, immutable,
+               precompressed=False):
+    try:
+        full_path = safe_join(document_root, path)
+    except (ValueError, SuspiciousFileOperation):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    content_type, encoding = mimetypes.guess_type(full_path)
+    file_path = full_path
+    if precompressed and encoding is None:
+        file_path, encoding = _find_precompressed(request, full_path)
+    stat = os.stat(file_path)
+
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        if settings.MEDIA_SERVE_MODE == 'django':
+            response = _file_response(request, file_path, stat.st_size, etag)
+        else:
+            served_path = path + file_path[len(full_path):]
+            response = _offloaded_response(
+                served_path, file_path, accel_prefix
+            )
+
+    if response.status_code != 416:
+        response['Content-Type'] = content_type or 'application/octet-stream'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if precompressed:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = (
+        f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        if immutable.search(path) else f'public, max-age={MEDIA_MAX_AGE}'
+    )
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    return serve_file(
+        request,
+        path,
+        settings.MEDIA_ROOT,
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX,
+        CONTENT_ADDRESSED_NAME,
+    )
+
+
+@require_safe
+def serve_static(request, path):
+    return serve_file(
+        request,
+        path,
+        settings.STATIC_ROOT,
+        settings.STATIC_ACCEL_REDIRECT_PREFIX,
+        HASHED_STATIC_NAME,
+        precompressed=True,
+    )
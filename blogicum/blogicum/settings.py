@@ -67,6 +67,20 @@ DATABASES = {
 }
 
 
+# Версии тегов и статистика кэша должны быть общими для всех воркеров
+# и management-команд, поэтому кэш не может жить в памяти процесса.
+# В продакшене файловый бэкенд стоит заменить на Redis или Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -98,6 +112,8 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static_dev'),
 ]
 
+STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -107,4 +123,24 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Как отдавать медиа- и статические файлы: 'django' — самим Django
+# с поддержкой Range, 'x-sendfile' — через Apache/lighttpd,
+# 'x-accel-redirect' — через nginx.
+MEDIA_SERVE_MODE = 'django'
+
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+STATIC_ACCEL_REDIRECT_PREFIX = '/protected-static/'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'blog.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'blogicum.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
+
 LOGIN_URL = 'login'
@@ -0,0 +1,70 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml',
+    '.html', '.ico', '.ttf', '.otf', '.eot',
+)
+
+COMPRESS_MIN_SIZE = 256
+
+
+def compress_gzip(content):
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+COMPRESSORS = {'.gz': compress_gzip}
+if brotli is not None:
+    COMPRESSORS['.br'] = compress_brotli
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as file:
+            content = file.read()
+        if len(content) < COMPRESS_MIN_SIZE:
+            return
+        for suffix, compressor in COMPRESSORS.items():
+            compressed = compressor(content)
+            if len(compressed) >= len(content):
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield compressed_name
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_names = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            yield name, hashed_name, processed
+            if not isinstance(processed, Exception) and hashed_name:
+                processed_names[hashed_name] = name
+        if dry_run:
+            return
+        for hashed_name, name in processed_names.items():
+            for compressed_name in self.compress(hashed_name):
+                yield name, compressed_name, True
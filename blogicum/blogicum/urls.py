@@ -4,6 +4,8 @@ from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
 
+from . import media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
 
@@ -18,6 +20,11 @@ urlpatterns = [
 
     path('pages/', include('pages.urls', namespace='pages')),
     path('', include('blog.urls', namespace='blog')),
+    path(
+        f'{settings.MEDIA_URL.lstrip("/")}<path:path>',
+        media.serve_media,
+        name='media',
+    ),
 ]
 
 handler404 = 'pages.views.page_not_found'
@@ -27,5 +34,11 @@ handler403 = 'pages.views.permission_denied'
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL,
                           document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL,
-                          document_root=settings.MEDIA_ROOT)
+else:
+    urlpatterns.append(
+        path(
+            f'{settings.STATIC_URL.lstrip("/")}<path:path>',
+            media.serve_static,
+            name='static',
+        )
+    )
@@ -1,12 +1,44 @@
+import hashlib
+import os
+from functools import lru_cache
+
+from django.conf import settings
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
 from django.views.generic import TemplateView
 
 
-class AboutPageView(TemplateView):
+@lru_cache(maxsize=None)
+def get_templates_mtime():
+    return int(max(
+        os.path.getmtime(os.path.join(root, name))
+        for template_dir in settings.TEMPLATES[0]['DIRS']
+        for root, _, names in os.walk(template_dir)
+        for name in names
+    ))
+
+
+class ConditionalTemplateView(TemplateView):
+    # Шапка страницы зависит от пользователя, а дата изменения шаблонов —
+    # нет, поэтому единственный валидатор здесь — ETag.
+    def get(self, request, *args, **kwargs):
+        etag = '"{}"'.format(hashlib.md5(
+            repr((self.template_name, get_templates_mtime(), request.user.pk))
+            .encode(),
+            usedforsecurity=False,
+        ).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+
+class AboutPageView(ConditionalTemplateView):
     template_name = "pages/about.html"
 
 
-class RulesPageView(TemplateView):
+class RulesPageView(ConditionalTemplateView):
     template_name = "pages/rules.html"
 
 
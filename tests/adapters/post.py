@@ -33,6 +33,9 @@ class PostModelAdapter(StudentModelAdapter):
             "author",
             "category",
             "location",
+            "image_width",
+            "image_height",
+            "image_placeholder",
             "refresh_from_db",
         ]
 
@@ -1,6 +1,7 @@
 import os
 import re
 import time
+from datetime import timedelta
 from http import HTTPStatus
 from inspect import getsource
 from pathlib import Path
@@ -24,6 +25,7 @@ from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -41,6 +43,60 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session", autouse=True)
+def shared_cache_dir(tmp_path_factory):
+    from django.conf import settings
+
+    location = tmp_path_factory.mktemp("cache")
+    caches = {
+        alias: {**config, "LOCATION": location}
+        for alias, config in settings.CACHES.items()
+    }
+    with override_settings(CACHES=caches):
+        yield location
+
+
+@pytest.fixture
+def run_django(shared_cache_dir, tmp_path):
+    import subprocess
+    import sys
+
+    from django.conf import settings
+
+    (tmp_path / "process_settings.py").write_text(
+        "from blogicum.settings import *  # noqa\n"
+        f"CACHES['default']['LOCATION'] = {str(shared_cache_dir)!r}\n"
+        "DATABASES['default']['NAME'] = "
+        f"{str(tmp_path / 'db.sqlite3')!r}\n"
+    )
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "process_settings",
+        "PYTHONPATH": os.pathsep.join(
+            [str(tmp_path), str(settings.BASE_DIR)]
+        ),
+    }
+
+    def run(*args):
+        result = subprocess.run(
+            [sys.executable, "-m", "django", *args],
+            capture_output=True, text=True, env=env,
+            cwd=settings.BASE_DIR,
+        )
+        assert result.returncode == 0, result.stderr
+        return result.stdout
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -108,6 +164,17 @@ def user(mixer):
     return user
 
 
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
 @pytest.fixture
 def another_user(mixer):
     User = get_user_model()
@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_authors(mixer: Mixer, published_category):
+    authors = mixer.cycle(30).blend("auth.User")
+    for author in authors:
+        mixer.blend("blog.Post", author=author, category=published_category)
+    return authors
+
+
+def test_changelist_does_not_list_every_author(admin_client, many_authors):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/blog/post/")
+    assert response.status_code == 200
+    content = response.content.decode()
+    sidebar = content[content.index('id="changelist-filter"'):]
+    sidebar = sidebar[:sidebar.index("</nav>")]
+    assert 'data-field-name="author"' in sidebar
+    assert not any(author.username in sidebar for author in many_authors), (
+        "Убедитесь, что фильтр по автору в админке не выводит список"
+        " всех пользователей, а подгружает варианты через автодополнение."
+    )
+    assert not any(
+        'from "auth_user"' in query["sql"].lower()
+        and "limit" not in query["sql"].lower()
+        for query in queries.captured_queries
+    )
+
+
+def test_autocomplete_filter_keeps_selected_author(admin_client, many_authors):
+    author = many_authors[0]
+    response = admin_client.get(
+        "/admin/blog/post/", {"author__id__exact": author.id}
+    )
+    assert response.status_code == 200
+    assert list(response.context["cl"].result_list) == list(
+        author.posts.all()
+    )
+    assert (
+        f'<option value="{author.id}" selected>{author.username}</option>'
+        in response.content.decode()
+    )
+
+
+def test_comment_filter_by_post(admin_client, mixer: Mixer, many_authors):
+    post = many_authors[0].posts.get()
+    comment = mixer.blend("blog.Comment", post=post)
+    mixer.blend("blog.Comment", post=many_authors[1].posts.get())
+    response = admin_client.get(
+        "/admin/blog/comment/", {"post__id__exact": post.id}
+    )
+    assert list(response.context["cl"].result_list) == [comment]
+
+
+def test_autocomplete_endpoint_searches_authors(admin_client, many_authors):
+    author = many_authors[0]
+    response = admin_client.get(
+        "/admin/autocomplete/",
+        {
+            "app_label": "blog",
+            "model_name": "post",
+            "field_name": "author",
+            "term": author.username,
+        },
+    )
+    assert response.status_code == 200
+    assert {"id": str(author.id), "text": str(author)} in (
+        response.json()["results"]
+    )
@@ -0,0 +1,59 @@
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count(post):
+    post.refresh_from_db(fields=["comment_count"])
+    return post.comment_count
+
+
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location, post_of_another_author
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    assert _count(post) == 3, (
+        "Убедитесь, что при добавлении комментария счётчик комментариев"
+        " публикации увеличивается."
+    )
+
+    comments[0].delete()
+    assert _count(post) == 2, (
+        "Убедитесь, что при удалении комментария счётчик комментариев"
+        " публикации уменьшается."
+    )
+
+    comments[1].post = post_of_another_author
+    comments[1].save()
+    assert _count(post) == 1
+    assert _count(post_of_another_author) == 1
+
+    comments[2].author.delete()
+    assert _count(post) == 0, (
+        "Убедитесь, что каскадное удаление комментариев обновляет счётчик."
+    )
+
+
+def test_recount_comments_command_repairs_counts(
+        mixer: Mixer, post_with_published_location
+):
+    from blog.models import Post
+
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command("recount_comments", batch_size=1)
+    assert _count(post) == 2
+
+
+def test_feed_query_does_not_join_comments():
+    from blog.services import get_posts_queryset
+
+    assert "blog_comment" not in str(get_posts_queryset().query), (
+        "Убедитесь, что запрос ленты публикаций не обращается к таблице"
+        " комментариев."
+    )
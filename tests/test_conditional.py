@@ -0,0 +1,133 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _urls(post):
+    return (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        "/pages/about/",
+        "/pages/rules/",
+    )
+
+
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_views_answer_not_modified(request, client_name, visible_post):
+    client = request.getfixturevalue(client_name)
+    for url in _urls(visible_post):
+        response = client.get(url)
+        assert response.has_header("ETag"), (
+            f"Убедитесь, что страница `{url}` отдаёт заголовок ETag."
+        )
+        repeated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что страница `{url}` отвечает `304 Not Modified`,"
+            " если содержимое не изменилось."
+        )
+
+
+def test_etag_changes_with_content(user_client, mixer: Mixer, visible_post):
+    url = f"/posts/{visible_post.id}/"
+    etag = user_client.get(url)["ETag"]
+    comment = mixer.blend("blog.Comment", post=visible_post)
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    etag = user_client.get(url)["ETag"]
+    comment.text = "changed"
+    comment.save()
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    etag = user_client.get(url)["ETag"]
+    comment.author.username = "renamed-commenter"
+    comment.author.save()
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    etag = user_client.get("/")["ETag"]
+    visible_post.title = "changed"
+    visible_post.save()
+    assert user_client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_not_modified_skips_view_queries(
+        client, django_assert_num_queries, visible_post
+):
+    for url in ("/", f"/posts/{visible_post.id}/"):
+        etag = client.get(url)["ETag"]
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            "Убедитесь, что ответ `304 Not Modified` формируется до"
+            " выполнения запросов представления."
+        )
+
+
+def test_feed_ignores_if_modified_since(
+        client, mixer: Mixer, visible_post
+):
+    url = f"/category/{visible_post.category.slug}/"
+    response = client.get(url)
+    assert not response.has_header("Last-Modified")
+    mixer.blend(
+        "blog.Post",
+        author=visible_post.author,
+        category=visible_post.category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("url", ["/pages/about/", "/pages/rules/"])
+def test_static_pages_use_etag_only(client, user_client, url):
+    response = user_client.get(url)
+    assert not response.has_header("Last-Modified")
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+    )
+    assert response.status_code == 200, (
+        "Убедитесь, что страницы с шапкой, зависящей от пользователя, не"
+        " отвечают `304` только по заголовку `If-Modified-Since`."
+    )
+
+
+def test_etag_changes_with_csrf_token(user_client, visible_post):
+    from django.conf import settings
+    from django.utils.crypto import get_random_string
+
+    url = f"/posts/{visible_post.id}/"
+    etag = user_client.get(url)["ETag"]
+    user_client.cookies[settings.CSRF_COOKIE_NAME] = get_random_string(32)
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что ETag страниц с формами меняется вместе с"
+        " CSRF-токеном."
+    )
+
+
+@pytest.mark.parametrize("change", ["comment", "category", "location"])
+def test_feed_etag_covers_cards(client, mixer: Mixer, visible_post, change):
+    etag = client.get("/")["ETag"]
+    if change == "comment":
+        mixer.blend("blog.Comment", post=visible_post)
+    elif change == "category":
+        visible_post.category.title = "renamed"
+        visible_post.category.save()
+    else:
+        location = mixer.blend("blog.Location", is_published=True)
+        visible_post.location = location
+        visible_post.save()
+        etag = client.get("/")["ETag"]
+        location.name = "renamed"
+        location.save()
+    assert client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == 200
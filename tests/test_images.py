@@ -0,0 +1,310 @@
+import hashlib
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def post_with_large_image(
+        mixer: Mixer, user, published_location, published_category,
+        django_capture_on_commit_callbacks,
+):
+    buffer = BytesIO()
+    Image.new("RGB", (700, 400), color=(73, 109, 137)).save(buffer, "JPEG")
+    with django_capture_on_commit_callbacks() as callbacks:
+        post = mixer.blend(
+            "blog.Post",
+            is_published=True,
+            location=published_location,
+            category=published_category,
+            author=user,
+            image=ContentFile(buffer.getvalue(), name="large.jpg"),
+        )
+    assert any(
+        getattr(callback, "__qualname__", "").startswith(
+            "schedule_renditions"
+        )
+        for callback in callbacks
+    ), (
+        "Убедитесь, что после загрузки изображения публикации"
+        " запускается создание его уменьшенных копий."
+    )
+    return post
+
+
+def _widths(renditions):
+    return [rendition["width"] for rendition in renditions]
+
+
+def _collect_media():
+    call_command("collect_media", "--min-age", "0", stdout=StringIO())
+
+
+def test_renditions_are_stored_by_content(
+        client, media_root, post_with_large_image
+):
+    from blog.images import generate_renditions
+    from blog.storage import CONTENT_ADDRESSED_NAME
+
+    post = post_with_large_image
+    assert _widths(generate_renditions(post.id)) == [320, 640]
+    post.refresh_from_db()
+    assert _widths(post.image_renditions) == [320, 640]
+    for rendition in post.image_renditions:
+        for extension in ("jpeg", "webp"):
+            name = rendition[extension]
+            assert CONTENT_ADDRESSED_NAME.search(name), (
+                "Убедитесь, что уменьшенные копии хранятся под именами,"
+                " вычисленными по их содержимому."
+            )
+            assert name.endswith(f".{extension}")
+            digest = hashlib.sha256((media_root / name).read_bytes())
+            assert digest.hexdigest() in name
+            with Image.open(media_root / name) as image:
+                assert image.width == rendition["width"]
+
+    content = client.get("/").content.decode()
+    assert 'type="image/webp"' in content
+    assert f'{post.image_renditions[0]["webp"]} 320w' in content
+    assert f'{post.image_renditions[1]["jpeg"]} 640w' in content
+
+
+def test_image_dimensions_and_placeholder(client, post_with_large_image):
+    from blog.images import generate_renditions
+
+    post = post_with_large_image
+    assert (post.image_width, post.image_height) == (700, 400), (
+        "Убедитесь, что размеры изображения сохраняются при загрузке."
+    )
+    generate_renditions(post.id)
+    post.refresh_from_db()
+    assert post.image_placeholder.startswith("data:image/webp;base64,")
+
+    content = client.get("/").content.decode()
+    assert 'width="700" height="400"' in content
+    assert 'loading="lazy"' in content
+    assert post.image_placeholder in content
+
+
+def test_undecodable_image_is_skipped(mixer: Mixer, post_with_large_image):
+    from blog.images import generate_renditions
+    from blog.models import Post
+
+    post = post_with_large_image
+    post.image = ContentFile(b"simple image content", name="broken.jpg")
+    post.save()
+    assert post.image_renditions == []
+    assert post.image_width is None and post.image_placeholder == ""
+    assert generate_renditions(post.id) == []
+    assert Post.objects.get(pk=post.id).image_renditions == []
+
+
+def test_backfill_renditions_command(post_with_large_image):
+    post = post_with_large_image
+    call_command("backfill_renditions")
+    post.refresh_from_db()
+    assert _widths(post.image_renditions) == [320, 640]
+
+
+def test_exif_is_stripped_and_orientation_applied(
+        media_root, post_with_large_image
+):
+    from blog.images import generate_renditions
+
+    post = post_with_large_image
+    image = Image.new("RGB", (700, 400))
+    exif = image.getexif()
+    exif[0x0112] = 6
+    exif[0x010F] = "Camera"
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", exif=exif)
+    post.image = ContentFile(buffer.getvalue(), name="rotated.jpg")
+    post.save()
+
+    uploaded_name = post.image.name
+    generate_renditions(post.id)
+    post.refresh_from_db()
+    assert (post.image_width, post.image_height) == (400, 700)
+    with Image.open(media_root / post.image.name) as original:
+        assert not original.getexif(), (
+            "Убедитесь, что из загруженного изображения удаляются"
+            " метаданные EXIF."
+        )
+        assert original.size == (400, 700)
+    digest = hashlib.sha256(
+        (media_root / post.image.name).read_bytes()
+    ).hexdigest()
+    assert post.image.name.endswith(f"/{digest}.jpg"), (
+        "Убедитесь, что очищенное изображение сохраняется под именем,"
+        " соответствующим его содержимому."
+    )
+    _collect_media()
+    assert not (media_root / uploaded_name).exists()
+
+
+def _png_header(width, height):
+    import struct
+    import zlib
+
+    def chunk(kind, data):
+        return (
+            struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IEND", b"")
+    )
+
+
+@pytest.mark.parametrize("size", [(10_000, 5_000), (100_000, 100_000)])
+def test_post_form_rejects_too_many_pixels(size):
+    from django.core.exceptions import ValidationError
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from blog.forms import PostImageField
+
+    upload = SimpleUploadedFile(
+        "bomb.png", _png_header(*size), content_type="image/png"
+    )
+    with pytest.raises(ValidationError) as error:
+        PostImageField().clean(upload)
+    assert [e.code for e in error.value.error_list] == ["too_many_pixels"], (
+        "Убедитесь, что изображения с чрезмерным числом пикселей"
+        " отклоняются по заголовку, до декодирования."
+    )
+
+
+def test_identical_images_are_stored_once(
+        mixer: Mixer, media_root, post_with_large_image
+):
+    from blog.images import generate_renditions
+    from blog.models import Post
+
+    first = post_with_large_image
+    generate_renditions(first.id)
+    first.refresh_from_db()
+    with first.image.open("rb") as file:
+        content = file.read()
+    second = mixer.blend(
+        "blog.Post",
+        author=first.author,
+        category=first.category,
+        image=ContentFile(content, name="copy.jpg"),
+    )
+    assert second.image.name == first.image.name, (
+        "Убедитесь, что одинаковые изображения хранятся в одном файле."
+    )
+    assert second.image.url == first.image.url
+    generate_renditions(second.id)
+    second.refresh_from_db()
+    assert second.image_renditions == first.image_renditions
+
+    rendition = media_root / first.image_renditions[0]["webp"]
+    first.delete()
+    _collect_media()
+    assert (media_root / second.image.name).exists(), (
+        "Убедитесь, что общий файл не удаляется, пока на него ссылаются"
+        " другие публикации."
+    )
+    assert rendition.exists()
+    Post.objects.get(pk=second.pk).delete()
+    _collect_media()
+    assert not (media_root / second.image.name).exists()
+    assert not rendition.exists()
+
+
+def test_backfill_skips_processed_narrow_images(
+        mixer: Mixer, user, published_category, django_assert_num_queries
+):
+    buffer = BytesIO()
+    Image.new("RGB", (200, 100)).save(buffer, "JPEG")
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        image=ContentFile(buffer.getvalue(), name="narrow.jpg"),
+    )
+    call_command("backfill_renditions")
+    post.refresh_from_db()
+    assert post.image_renditions == [] and post.image_placeholder
+    with django_assert_num_queries(1):
+        call_command("backfill_renditions")
+
+
+def test_obsolete_renditions_are_deleted(
+        settings, media_root, monkeypatch, post_with_large_image
+):
+    from blog import images
+
+    post = post_with_large_image
+    images.generate_renditions(post.id)
+    post.refresh_from_db()
+    stale = media_root / post.image_renditions[1]["webp"]
+    assert stale.exists()
+    monkeypatch.setattr(images, "IMAGE_RENDITION_WIDTHS", (320,))
+    call_command("backfill_renditions", "--all")
+    post.refresh_from_db()
+    assert _widths(post.image_renditions) == [320]
+    _collect_media()
+    assert not stale.exists(), (
+        "Убедитесь, что устаревшие уменьшенные копии удаляются."
+    )
+
+
+def test_storage_hashes_names_that_only_look_hashed(media_root):
+    from blog.storage import ContentAddressedStorage
+
+    storage = ContentAddressedStorage(location=media_root)
+    digest = hashlib.sha256(b"content").hexdigest()
+    for name in (
+        f"posts/2026/10/18/{'ab' * 32}.jpg",
+        f"posts/{digest[:2]}/{digest[2:4]}/{'0' * 64}.jpg",
+        f"posts/{digest[:2]}/{digest[2:4]}/{digest}.320w.jpg",
+    ):
+        assert storage.save(name, ContentFile(b"content")) == (
+            f"posts/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+        ), (
+            "Убедитесь, что имя файла всегда вычисляется по его"
+            " содержимому."
+        )
+
+
+def test_collect_media_keeps_recent_files(media_root, post_with_large_image):
+    from blog.models import Post
+
+    name = post_with_large_image.image.name
+    Post.objects.all().delete()
+    call_command("collect_media", stdout=StringIO())
+    assert (media_root / name).exists(), (
+        "Убедитесь, что недавно сохранённые файлы не удаляются: на них"
+        " может ссылаться ещё не завершённая загрузка."
+    )
+    _collect_media()
+    assert not (media_root / name).exists()
+
+
+def test_deduplicated_upload_refreshes_file(media_root):
+    import os
+
+    from blog.storage import ContentAddressedStorage
+
+    storage = ContentAddressedStorage(location=media_root)
+    name = storage.save("posts/first.jpg", ContentFile(b"content"))
+    os.utime(media_root / name, (0, 0))
+    assert storage.save("posts/second.jpg", ContentFile(b"content")) == name
+    assert (media_root / name).stat().st_mtime > 0
@@ -0,0 +1,78 @@
+import pytest
+from django.urls import reverse, set_script_prefix
+
+
+@pytest.mark.parametrize(
+    "viewname, arg",
+    [
+        ("blog:post_detail", 42),
+        ("blog:category_posts", "some-slug"),
+        ("blog:profile", "user.name+tag@mail"),
+        ("blog:profile", "пользователь"),
+    ],
+)
+@pytest.mark.parametrize("script_prefix", ["/", "/blog/"])
+def test_fast_reverse_matches_reverse(viewname, arg, script_prefix):
+    from blog.links import fast_reverse
+
+    set_script_prefix(script_prefix)
+    try:
+        assert fast_reverse(viewname, arg) == reverse(
+            viewname, args=[arg]
+        ), (
+            "Убедитесь, что быстрое построение ссылок даёт тот же адрес,"
+            " что и `reverse()`."
+        )
+    finally:
+        set_script_prefix("/")
+
+
+@pytest.mark.django_db
+def test_feed_cards_link_to_post_author_and_category(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    content = client.get("/").content.decode()
+    for url in (
+        reverse("blog:post_detail", args=[post.id]),
+        reverse("blog:profile", args=[post.author.username]),
+        reverse("blog:category_posts", args=[post.category.slug]),
+    ):
+        assert f'href="{url}"' in content
+
+
+@pytest.mark.parametrize(
+    "viewname, arg",
+    [
+        ("blog:post_detail", "not-a-number"),
+        ("blog:post_detail", -1),
+        ("blog:category_posts", "не slug"),
+        ("blog:profile", "with/slash"),
+    ],
+)
+def test_fast_reverse_validates_converters(viewname, arg):
+    from django.urls import NoReverseMatch
+
+    from blog.links import fast_reverse
+
+    with pytest.raises(NoReverseMatch):
+        reverse(viewname, args=[arg])
+    with pytest.raises(NoReverseMatch):
+        fast_reverse(viewname, arg)
+
+
+@pytest.mark.django_db
+def test_card_cache_is_keyed_by_script_prefix(post_with_published_location):
+    from blog.templatetags.blog_tags import post_card
+
+    post = post_with_published_location
+    html = post_card(post)
+    set_script_prefix("/blog/")
+    try:
+        del post.detail_url
+        assert f'href="/blog/posts/{post.id}/"' in post_card(post), (
+            "Убедитесь, что кэш карточек учитывает префикс адресов."
+        )
+    finally:
+        set_script_prefix("/")
+    assert f'href="/posts/{post.id}/"' in html
@@ -0,0 +1,153 @@
+import pytest
+
+HASHED_NAME = "posts/ab/cd/" + "abcd" * 16 + ".jpg"
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    path = tmp_path / HASHED_NAME
+    path.parent.mkdir(parents=True)
+    path.write_bytes(bytes(range(256)) * 4)
+    return path
+
+
+def test_media_is_served_with_validators(client, media_file):
+    response = client.get(f"/media/{HASHED_NAME}")
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == media_file.read_bytes()
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Accept-Ranges"] == "bytes"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хэшем в имени отдаются с заголовком"
+        " `Cache-Control: immutable`."
+    )
+
+    response = client.get(
+        f"/media/{HASHED_NAME}", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [("bytes=10-19", (10, 19)), ("bytes=-16", (1008, 1023)),
+     ("bytes=1000-", (1000, 1023))],
+)
+def test_media_range_requests(client, media_file, header, expected):
+    start, end = expected
+    response = client.get(f"/media/{HASHED_NAME}", HTTP_RANGE=header)
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes {start}-{end}/1024"
+    body = b"".join(response.streaming_content)
+    assert body == media_file.read_bytes()[start:end + 1], (
+        "Убедитесь, что при запросе с заголовком `Range` возвращается"
+        " только запрошенная часть файла."
+    )
+
+
+def test_media_unsatisfiable_range(client, media_file):
+    response = client.get(f"/media/{HASHED_NAME}", HTTP_RANGE="bytes=5000-")
+    assert response.status_code == 416
+    assert response["Content-Range"] == "bytes */1024"
+
+
+def test_media_invalid_range_is_ignored(client, media_file):
+    response = client.get(f"/media/{HASHED_NAME}", HTTP_RANGE="bytes=5-2")
+    assert response.status_code == 200, (
+        "Убедитесь, что синтаксически неверный заголовок `Range`"
+        " игнорируется и отдаётся весь файл."
+    )
+    assert b"".join(response.streaming_content) == media_file.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "mode, header, value",
+    [
+        ("x-accel-redirect", "X-Accel-Redirect",
+         f"/protected-media/{HASHED_NAME}"),
+        ("x-sendfile", "X-Sendfile", None),
+    ],
+)
+def test_media_offload_modes(client, settings, media_file, mode, header,
+                             value):
+    settings.MEDIA_SERVE_MODE = mode
+    response = client.get(f"/media/{HASHED_NAME}")
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response[header] == (value or str(media_file))
+
+
+def test_media_outside_root_is_not_served(client, media_file):
+    response = client.get("/media/../settings.py")
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def collected_static(settings, tmp_path):
+    source = tmp_path / "source"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "site.css").write_text(
+        "body { color: #333; }\n" * 100
+    )
+    (source / "img").mkdir()
+    (source / "img" / "logo.png").write_bytes(b"\x89PNG" + b"\0" * 512)
+    settings.STATICFILES_DIRS = [source]
+    settings.STATIC_ROOT = tmp_path / "static"
+    from django.core.management import call_command
+
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return settings.STATIC_ROOT
+
+
+def test_collectstatic_hashes_and_precompresses(collected_static):
+    import gzip
+
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    url = staticfiles_storage.url("css/site.css")
+    hashed_name = url.removeprefix("/static/")
+    assert hashed_name != "css/site.css", (
+        "Убедитесь, что `{% static %}` выдаёт имена файлов с хэшем"
+        " содержимого."
+    )
+    original = (collected_static / hashed_name).read_bytes()
+    compressed = collected_static / (hashed_name + ".gz")
+    assert gzip.decompress(compressed.read_bytes()) == original
+    assert not list(collected_static.glob("img/logo.*.png.gz"))
+
+
+def test_hashed_static_is_served_precompressed(client, collected_static):
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    url = staticfiles_storage.url("css/site.css")
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"] == "text/css"
+    assert response["Vary"] == "Accept-Encoding"
+    assert "immutable" in response["Cache-Control"]
+
+    response = client.get(url)
+    assert "Content-Encoding" not in response
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [("br;q=0, gzip", "gzip"), ("gzip;q=0", None), ("*", "gzip"),
+     ("*, gzip;q=0", None)],
+)
+def test_precompressed_static_honours_quality(client, collected_static,
+                                              accept_encoding, expected):
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    url = staticfiles_storage.url("css/site.css")
+    response = client.get(url, HTTP_ACCEPT_ENCODING=accept_encoding)
+    assert response.get("Content-Encoding") == expected
+
+
+def test_static_url_without_manifest_falls_back(settings, tmp_path):
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    settings.STATIC_ROOT = tmp_path
+    assert staticfiles_storage.url("img/logo.png") == "/static/img/logo.png"
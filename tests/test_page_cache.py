@@ -0,0 +1,248 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_feed_is_served_from_cache(client, visible_post):
+    from blog.page_cache import get_page_cache_stats
+
+    first = client.get("/")
+    second = client.get("/")
+    assert first.content == second.content
+    stats = get_page_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1, (
+        "Убедитесь, что повторный анонимный запрос ленты обслуживается"
+        " из кэша страниц."
+    )
+
+
+@pytest.mark.parametrize(
+    "change",
+    ["post", "author", "category", "comment"],
+)
+def test_cached_feed_is_invalidated(
+        client, mixer: Mixer, visible_post, change
+):
+    from blog.page_cache import get_page_cache_stats
+
+    urls = (
+        "/",
+        f"/category/{visible_post.category.slug}/",
+        f"/profile/{visible_post.author.username}/",
+    )
+    for url in urls:
+        client.get(url)
+
+    marker = "cache-invalidation-marker"
+    if change == "post":
+        visible_post.title = marker
+        visible_post.save()
+    elif change == "author":
+        visible_post.author.username = marker
+        visible_post.author.save()
+        urls = urls[:2] + (f"/profile/{marker}/",)
+    elif change == "category":
+        visible_post.category.title = marker
+        visible_post.category.save()
+    else:
+        mixer.cycle(7).blend("blog.Comment", post=visible_post)
+        marker = "(7)"
+
+    for url in urls:
+        assert marker in client.get(url).content.decode(), (
+            "Убедитесь, что кэш страницы ленты сбрасывается при изменении"
+            " отображаемых на ней публикаций, авторов, категорий и"
+            " комментариев."
+        )
+    assert get_page_cache_stats()["invalidations"] >= 2
+
+
+def test_authenticated_requests_bypass_cache(user_client, visible_post):
+    from blog.page_cache import get_page_cache_stats
+
+    user_client.get("/")
+    user_client.get("/")
+    assert get_page_cache_stats()["hits"] == 0
+
+
+def test_post_card_fragment_is_cached_and_versioned(
+        user_client, mixer: Mixer, visible_post, monkeypatch
+):
+    from django.core.cache import cache
+
+    from blog.constants import POST_CARD_CACHE_PREFIX
+
+    stored_keys = []
+    store = cache.set
+
+    def spy(key, *args, **kwargs):
+        stored_keys.append(key)
+        return store(key, *args, **kwargs)
+
+    monkeypatch.setattr(cache, "set", spy)
+    user_client.get("/")
+    card_keys = [
+        key for key in stored_keys
+        if key.startswith(f"{POST_CARD_CACHE_PREFIX}:")
+    ]
+    assert len(card_keys) == 1, (
+        "Убедитесь, что карточка публикации кэшируется как фрагмент."
+    )
+
+    visible_post.location = mixer.blend(
+        "blog.Location", is_published=True, name="fragment-marker"
+    )
+    visible_post.save()
+    assert "fragment-marker" in user_client.get("/").content.decode()
+
+    visible_post.location.name = "fragment-marker-renamed"
+    visible_post.location.save()
+    assert "fragment-marker-renamed" in user_client.get("/").content.decode(), (
+        "Убедитесь, что версия фрагмента карточки меняется при изменении"
+        " местоположения публикации."
+    )
+
+
+@pytest.mark.parametrize("field", ["category", "author"])
+def test_moving_post_invalidates_old_feed(
+        client, mixer: Mixer, visible_post, field
+):
+    from blog.constants import POSTS_PER_PAGE
+
+    old_posts = mixer.cycle(POSTS_PER_PAGE + 1).blend(
+        "blog.Post",
+        author=visible_post.author,
+        category=visible_post.category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=2),
+    )
+    if field == "category":
+        url = f"/category/{visible_post.category.slug}/"
+        new_value = mixer.blend("blog.Category", is_published=True)
+    else:
+        url = f"/profile/{visible_post.author.username}/"
+        new_value = mixer.blend("auth.User")
+    first_on_second_page = old_posts[1]
+    assert f"/posts/{first_on_second_page.id}/" in client.get(
+        url, {"page": 2}
+    ).content.decode()
+
+    setattr(visible_post, field, new_value)
+    visible_post.save()
+    response = client.get(url, {"page": 2})
+    assert f"/posts/{first_on_second_page.id}/" not in (
+        response.content.decode()
+    ), (
+        "Убедитесь, что при переносе публикации в другую категорию или к"
+        " другому автору сбрасывается кэш прежней ленты."
+    )
+
+
+def test_unknown_query_params_do_not_fill_cache(client, visible_post):
+    from blog.page_cache import get_page_cache_stats
+
+    client.get("/", {"utm_source": "a"})
+    client.get("/", {"utm_source": "b"})
+    assert get_page_cache_stats()["hits"] == 0, (
+        "Убедитесь, что страницы с посторонними параметрами запроса не"
+        " сохраняются в кэш страниц."
+    )
+    client.get("/")
+    response = client.get("/", {"utm_source": "c"})
+    assert get_page_cache_stats()["hits"] == 1
+    assert "utm_source" not in response.content.decode()
+
+
+@pytest.mark.parametrize("param", ["page", "cursor"])
+def test_invalid_page_params_do_not_fill_cache(client, visible_post, param):
+    from blog.page_cache import get_page_cache_stats
+
+    for attempt in range(2):
+        for value in ("junk0", "junk1", "01"):
+            client.get("/", {param: value})
+    assert get_page_cache_stats()["hits"] == 0, (
+        "Убедитесь, что страницы с неверными номерами страниц и курсорами"
+        " не сохраняются в кэш страниц."
+    )
+    client.get("/", {"page": 1})
+    client.get("/", {"page": 1})
+    assert get_page_cache_stats()["hits"] == 1
+
+
+def test_valid_cursor_pages_are_cached(client, mixer: Mixer, visible_post):
+    from blog.constants import POSTS_PER_PAGE
+    from blog.page_cache import get_page_cache_stats
+
+    mixer.cycle(POSTS_PER_PAGE).blend(
+        "blog.Post",
+        author=visible_post.author,
+        category=visible_post.category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=2),
+    )
+    cursor = client.get("/").context["page_obj"].next_cursor
+    client.get("/", {"cursor": cursor})
+    client.get("/", {"cursor": cursor})
+    assert get_page_cache_stats()["hits"] == 1
+
+
+def test_cache_is_shared_between_processes(client, visible_post, run_django):
+    from blog.cache import get_tag_versions
+    from blog.constants import INDEX_FEED_CACHE_TAG
+
+    client.get("/")
+    client.get("/")
+    assert "Попадания: 1" in run_django("page_cache_stats"), (
+        "Убедитесь, что статистика кэша страниц видна из management-команды."
+    )
+
+    before = get_tag_versions([INDEX_FEED_CACHE_TAG])
+    run_django(
+        "shell", "-c",
+        f"from blog.cache import bump_tags; bump_tags({INDEX_FEED_CACHE_TAG!r})",
+    )
+    assert get_tag_versions([INDEX_FEED_CACHE_TAG]) != before, (
+        "Убедитесь, что инвалидация в одном процессе видна другим процессам."
+    )
+
+
+@pytest.mark.parametrize(
+    "command, url, marker",
+    [
+        ("recount_comments", "/", "Комментарии (0)"),
+        ("rerender_html", "/posts/{id}/", "перерисовано</p>"),
+        ("refresh_visibility", "/", "Комментарии (0)"),
+    ],
+)
+def test_bulk_maintenance_invalidates_pages(
+        client, visible_post, command, url, marker
+):
+    from django.core.management import call_command
+
+    from blog.models import Post
+
+    url = url.format(id=visible_post.id)
+    drift = {
+        "recount_comments": {"comment_count": 7},
+        "rerender_html": {
+            "text": "перерисовано", "text_html": "<p>устарело</p>",
+        },
+        "refresh_visibility": {"is_visible": False},
+    }[command]
+    Post.objects.filter(pk=visible_post.pk).update(**drift)
+    first = client.get(url)
+    assert marker not in first.content.decode()
+
+    call_command(command, stdout=StringIO())
+    response = client.get(url, HTTP_IF_NONE_MATCH=first.get("ETag", ""))
+    assert response.status_code == 200
+    assert marker in response.content.decode(), (
+        "Убедитесь, что массовые обновления публикаций сбрасывают кэш"
+        " страниц, карточек и ETag."
+    )
+
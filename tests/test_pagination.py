@@ -0,0 +1,242 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_posts_same_date(mixer: Mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_date,
+    )
+
+
+def _walk(client, url, first_page):
+    seen = [post.id for post in first_page]
+    page_obj = first_page
+    while getattr(page_obj, "next_cursor", None):
+        response = client.get(url, {"cursor": page_obj.next_cursor})
+        page_obj = response.context["page_obj"]
+        seen.extend(post.id for post in page_obj)
+    return seen, page_obj
+
+
+def test_keyset_pagination_walks_whole_feed(
+        client, many_posts_same_date
+):
+    response = client.get("/")
+    seen, last_page = _walk(client, "/", response.context["page_obj"])
+    expected = sorted(
+        (post.id for post in many_posts_same_date), reverse=True
+    )
+    assert seen == expected, (
+        "Убедитесь, что при переходе по курсорам ленты каждая публикация"
+        " выводится ровно один раз и в порядке убывания `(pub_date, id)`."
+    )
+    assert not last_page.has_next()
+
+    response = client.get("/", {"cursor": last_page.previous_cursor})
+    previous_ids = [post.id for post in response.context["page_obj"]]
+    assert previous_ids == expected[N_PER_PAGE:N_PER_PAGE * 2], (
+        "Убедитесь, что курсор на предыдущую страницу возвращает"
+        " предыдущую страницу ленты."
+    )
+
+
+def test_invalid_cursor_returns_first_page(client, many_posts_same_date):
+    response = client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 200
+    page_obj = response.context["page_obj"]
+    assert len(page_obj) == N_PER_PAGE
+    assert not page_obj.has_previous()
+
+
+def test_cached_feed_count_is_invalidated_on_post_save(
+        client, mixer: Mixer, user, published_category, many_posts_same_date
+):
+    response = client.get("/")
+    count = response.context["page_obj"].paginator.count
+    assert count == len(many_posts_same_date)
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    response = client.get("/")
+    assert response.context["page_obj"].paginator.count == count + 1, (
+        "Убедитесь, что закэшированное число публикаций в ленте"
+        " сбрасывается при сохранении публикации."
+    )
+
+
+@pytest.mark.parametrize("strategy", ["exact", "cached", "estimated"])
+def test_count_strategies(rf, strategy, many_posts_same_date):
+    from blog.services import get_paginated_queryset, get_posts_queryset
+
+    page_obj = get_paginated_queryset(
+        rf.get("/"),
+        get_posts_queryset(),
+        count_strategy=strategy,
+        count_key=("test",),
+    )
+    assert page_obj.paginator.count == len(many_posts_same_date)
+
+
+def test_post_comments_are_paginated(
+        client, mixer: Mixer, post_with_published_location
+):
+    from blog.constants import COMMENTS_PER_PAGE
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 2).blend(
+        "blog.Comment", post=post
+    )
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert [c.id for c in page] == [c.id for c in comments][
+        :COMMENTS_PER_PAGE
+    ], (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " страница комментариев."
+    )
+
+    fragment = client.get(
+        f"/posts/{post.id}/comments/", {"cursor": page.next_cursor}
+    )
+    assert fragment.status_code == 200
+    rest = [c.id for c in fragment.context["comments"]]
+    assert rest == [c.id for c in comments][COMMENTS_PER_PAGE:], (
+        "Убедитесь, что фрагмент со следующей порцией комментариев"
+        " продолжает список с места, где он закончился."
+    )
+    assert "<form" not in fragment.content.decode()
+
+
+def test_feed_rows_match_model_instances(rf, many_posts_same_date):
+    from django.template.loader import render_to_string
+
+    from blog.links import add_card_urls
+    from blog.services import get_paginated_queryset, get_posts_queryset
+
+    request = rf.get("/")
+    posts = get_paginated_queryset(
+        request, get_posts_queryset(), as_rows=False
+    )
+    rows = get_paginated_queryset(request, get_posts_queryset(), as_rows=True)
+    add_card_urls(posts)
+    add_card_urls(rows)
+    assert [row.pk for row in rows] == [post.pk for post in posts]
+    assert rows.next_cursor == posts.next_cursor
+    for post, row in zip(posts, rows):
+        assert render_to_string(
+            "includes/post_card.html", {"post": row}
+        ) == render_to_string("includes/post_card.html", {"post": post}), (
+            "Убедитесь, что облегчённые строки ленты отрисовываются так же,"
+            " как объекты публикаций."
+        )
+
+    keyset = get_paginated_queryset(
+        rf.get("/", {"cursor": posts.next_cursor}),
+        get_posts_queryset(),
+        as_rows=True,
+    )
+    assert len(keyset) == N_PER_PAGE
+
+
+def test_page_range_is_elided(rf, many_posts_same_date):
+    from django.core.paginator import Paginator
+    from django.template.loader import render_to_string
+
+    from blog.services import get_paginated_queryset, get_posts_queryset
+
+    request = rf.get("/", {"page": 10})
+    page_obj = get_paginated_queryset(
+        request, get_posts_queryset(), per_page=1
+    )
+    assert page_obj.elided_page_range == [
+        1, Paginator.ELLIPSIS, 8, 9, 10, 11, 12, Paginator.ELLIPSIS,
+        len(many_posts_same_date),
+    ]
+    html = render_to_string(
+        "includes/paginator.html", {"page_obj": page_obj}, request
+    )
+    assert html.count('class="page-item"') + html.count(
+        'class="page-item active"'
+    ) < 15, (
+        "Убедитесь, что пагинатор выводит только соседние страницы,"
+        " а не ссылку на каждую страницу ленты."
+    )
+    assert f'?page={len(many_posts_same_date)}"' in html
+
+
+def test_estimated_count_does_not_cap_navigation(
+        rf, monkeypatch, many_posts_same_date
+):
+    from blog import services
+
+    monkeypatch.setattr(services, "FEED_COUNT_ESTIMATE_LIMIT", N_PER_PAGE)
+    total = len(many_posts_same_date)
+    request = rf.get("/", {"page": 3})
+    page_obj = services.get_paginated_queryset(
+        request,
+        services.get_posts_queryset(),
+        count_strategy="estimated",
+        keyset=False,
+    )
+    assert str(page_obj.paginator.count) == f"{N_PER_PAGE}+"
+    assert page_obj.number == 3, (
+        "Убедитесь, что при оценочном подсчёте публикаций можно перейти"
+        " на страницы за пределами оценки."
+    )
+    assert len(page_obj) == total - N_PER_PAGE * 2
+    assert not page_obj.has_next()
+    assert page_obj.end_index() == total
+
+    page_obj = services.get_paginated_queryset(
+        rf.get("/", {"page": 2}),
+        services.get_posts_queryset(),
+        count_strategy="estimated",
+        keyset=False,
+    )
+    assert page_obj.has_next() and page_obj.next_page_number() == 3
+    assert page_obj.elided_page_range[-1] == page_obj.paginator.ELLIPSIS
+
+
+def test_comment_batches_link_back(
+        client, mixer: Mixer, post_with_published_location
+):
+    from blog.constants import COMMENTS_PER_PAGE
+
+    post = post_with_published_location
+    mixer.cycle(COMMENTS_PER_PAGE + 2).blend("blog.Comment", post=post)
+    first = client.get(f"/posts/{post.id}/")
+    assert "<script>" not in first.content.decode()
+    cursor = first.context["comments"].next_cursor
+    second = client.get(f"/posts/{post.id}/", {"comments_cursor": cursor})
+    content = second.content.decode()
+    assert f'href="/posts/{post.id}/"' in content, (
+        "Убедитесь, что со следующей порции комментариев можно вернуться"
+        " к первой порции без JavaScript."
+    )
+    previous_cursor = second.context["comments"].previous_cursor
+    assert f"?comments_cursor={previous_cursor}" in content
+
+
+def test_feeds_render_rows_by_default(client, many_posts_same_date):
+    from blog.rows import PostRow
+
+    page_obj = client.get("/").context["page_obj"]
+    assert all(isinstance(post, PostRow) for post in page_obj)
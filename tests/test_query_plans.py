@@ -0,0 +1,96 @@
+import re
+
+import pytest
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="EXPLAIN QUERY PLAN is SQLite-specific",
+    ),
+]
+
+FULL_SCAN_RE = re.compile(r"\bSCAN (blog_post|blog_comment)\b(?! USING)")
+
+
+def _assert_no_full_scan(queryset, description):
+    plan = queryset.explain()
+    assert not FULL_SCAN_RE.search(plan), (
+        f"Убедитесь, что запрос {description} не выполняет полный"
+        f" просмотр таблицы. План запроса:\n{plan}"
+    )
+
+
+def test_feed_queries_use_indexes(user, published_category):
+    from blog.services import get_posts_queryset
+
+    _assert_no_full_scan(get_posts_queryset(), "главной ленты")
+    _assert_no_full_scan(
+        get_posts_queryset(published_category.posts.all()),
+        "ленты категории",
+    )
+    _assert_no_full_scan(
+        get_posts_queryset(user.posts.all()), "ленты профиля"
+    )
+    _assert_no_full_scan(
+        get_posts_queryset(user.posts.all(), for_admin_or_author=True),
+        "ленты профиля для автора",
+    )
+
+
+def test_post_comments_query_uses_index(post_with_published_location):
+    _assert_no_full_scan(
+        post_with_published_location.comments.select_related("author"),
+        "комментариев к публикации",
+    )
+
+
+def test_post_detail_is_a_primary_key_lookup(post_with_published_location):
+    from blog.services import get_posts_queryset
+
+    plan = get_posts_queryset(for_admin_or_author=True).filter(
+        id=post_with_published_location.id
+    ).explain()
+    assert "SEARCH blog_post USING INTEGER PRIMARY KEY" in plan, (
+        "Убедитесь, что публикация для страницы поста выбирается по"
+        f" первичному ключу. План запроса:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan
+
+
+def test_feed_query_defers_post_text(mixer, user, published_category):
+    from blog.services import get_posts_queryset
+
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        text="один два три четыре пять шесть семь восемь девять десять"
+             " одиннадцать",
+    )
+    assert post.excerpt == (
+        "один два три четыре пять шесть семь восемь девять десять …"
+    ), "Убедитесь, что анонс публикации вычисляется при сохранении."
+    assert '"blog_post"."text"' not in str(get_posts_queryset().query), (
+        "Убедитесь, что запрос ленты не загружает полный текст публикаций."
+    )
+
+
+@pytest.mark.parametrize("search_term", ["сиян", "погода сиян"])
+def test_admin_post_search_uses_indexes(rf, search_term):
+    from django.contrib.admin.sites import site
+
+    from blog.models import Post
+
+    post_admin = site._registry[Post]
+    request = rf.get("/admin/blog/post/")
+    queryset, _ = post_admin.get_search_results(
+        request, post_admin.get_queryset(request), search_term
+    )
+    _assert_no_full_scan(queryset, "поиска публикаций в админке")
+    plan = queryset.explain()
+    assert "MULTI-INDEX OR" in plan, (
+        "Убедитесь, что поиск в админке сужает авторов и категории"
+        f" отдельными подзапросами. План запроса:\n{plan}"
+    )
@@ -0,0 +1,38 @@
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_text_html_is_rendered_on_save(
+        mixer: Mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.text = "<b>bold</b>\nnext line"
+    post.save()
+    assert post.text_html == "&lt;b&gt;bold&lt;/b&gt;<br>next line", (
+        "Убедитесь, что при сохранении публикации её текст сохраняется"
+        " в виде экранированного HTML."
+    )
+    comment = mixer.blend("blog.Comment", post=post, text="a\nb")
+    assert comment.text_html == "a<br>b"
+
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert post.text_html in content
+    assert comment.text_html in content
+
+
+def test_rerender_html_command(mixer: Mixer, post_with_published_location):
+    from blog.models import Comment, Post
+
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, text="x\ny")
+    Post.objects.filter(pk=post.pk).update(text_html="")
+    Comment.objects.filter(pk=comment.pk).update(text_html="")
+
+    call_command("rerender_html")
+    post.refresh_from_db()
+    comment.refresh_from_db()
+    assert post.text_html == Post.render_text(post.text)
+    assert comment.text_html == "x<br>y"
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer: Mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=10),
+    )
+
+
+def test_scheduler_publishes_due_posts(scheduled_post):
+    from blog.scheduler import PublicationScheduler
+    from blog.signals import posts_became_visible
+
+    received = []
+
+    def on_visible(sender, post_ids, **kwargs):
+        received.extend(post_ids)
+
+    posts_became_visible.connect(on_visible)
+    try:
+        now = timezone.now()
+        scheduler = PublicationScheduler()
+        scheduler.load(now)
+        assert scheduler.next_due() == scheduled_post.pub_date
+        assert scheduler.publish_due(now) == []
+
+        later = scheduled_post.pub_date + timedelta(seconds=1)
+        assert scheduler.publish_due(later) == [scheduled_post.pk]
+        assert received == [scheduled_post.pk], (
+            "Убедитесь, что планировщик отправляет событие, когда отложенная"
+            " публикация становится видна в ленте."
+        )
+        assert scheduler.next_due() is None
+    finally:
+        posts_became_visible.disconnect(on_visible)
+
+
+def test_safe_cache_timeout_stops_at_next_visibility_change(scheduled_post):
+    from blog.services import (
+        get_next_visibility_change,
+        get_safe_cache_timeout,
+    )
+
+    now = timezone.now()
+    assert get_next_visibility_change(now) == scheduled_post.pub_date
+    assert get_safe_cache_timeout(60 * 60, now) <= 10 * 60, (
+        "Убедитесь, что время жизни кэша не превышает времени до ближайшей"
+        " отложенной публикации."
+    )
+
+
+def test_scheduler_process_invalidates_shared_cache(run_django):
+    from blog.cache import get_tag_versions
+    from blog.constants import INDEX_FEED_CACHE_TAG
+
+    run_django("migrate", "--verbosity", "0")
+    run_django(
+        "shell", "-c",
+        "from datetime import timedelta\n"
+        "from django.contrib.auth.models import User\n"
+        "from django.utils import timezone\n"
+        "from blog.models import Category, Post\n"
+        "Post.objects.create(\n"
+        "    title='t', text='t', is_published=True,\n"
+        "    author=User.objects.create(username='author'),\n"
+        "    category=Category.objects.create(\n"
+        "        title='c', slug='c', is_published=True\n"
+        "    ),\n"
+        "    pub_date=timezone.now() - timedelta(seconds=1),\n"
+        ")\n",
+    )
+    before = get_tag_versions([INDEX_FEED_CACHE_TAG])
+    assert "Опубликовано: 1" in run_django("run_scheduler", "--once")
+    assert get_tag_versions([INDEX_FEED_CACHE_TAG]) != before, (
+        "Убедитесь, что событие планировщика из отдельного процесса"
+        " инвалидирует кэш веб-воркеров."
+    )
+
+
+def test_scheduler_refuses_process_local_cache(settings):
+    from django.core.management import CommandError, call_command
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+    with pytest.raises(CommandError):
+        call_command("run_scheduler", "--once")
@@ -0,0 +1,133 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def blend_post(mixer: Mixer, user, published_category):
+    def blend(**kwargs):
+        kwargs.setdefault("pub_date", timezone.now() - timedelta(days=1))
+        kwargs.setdefault("is_published", True)
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category, **kwargs
+        )
+
+    return blend
+
+
+def _found(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranks_title_matches_first(client, blend_post):
+    in_text = blend_post(title="Заметки", text="Про вулканы Камчатки")
+    in_title = blend_post(title="Вулканы Камчатки", text="Путешествие")
+    blend_post(title="Другое", text="Ничего общего")
+    blend_post(title="Вулканы", text="Скрыто", is_published=False)
+    assert _found(client, "вулкан") == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит опубликованные публикации по"
+        " заголовку и тексту и ставит совпадения в заголовке выше."
+    )
+
+
+def test_search_index_follows_edits_and_deletes(client, blend_post):
+    post = blend_post(title="Старый заголовок", text="текст")
+    assert _found(client, "старый") == [post.id]
+    post.title = "Новый заголовок"
+    post.save()
+    assert _found(client, "старый") == []
+    assert _found(client, "новый") == [post.id]
+    post.delete()
+    assert _found(client, "новый") == []
+
+
+def test_search_is_paginated_and_keeps_query(client, blend_post):
+    posts = [
+        blend_post(title=f"Рецепт {i}", text="пирог") for i in range(
+            N_PER_PAGE + 2
+        )
+    ]
+    response = client.get("/search/", {"q": "пирог"})
+    page_obj = response.context["page_obj"]
+    assert page_obj.paginator.count == len(posts)
+    assert len(page_obj) == N_PER_PAGE
+    assert "q=%D0%BF%D0%B8%D1%80%D0%BE%D0%B3&amp;page=2" in (
+        response.content.decode()
+    ), "Убедитесь, что ссылки пагинатора поиска сохраняют запрос."
+    assert len(_found(client, "пирог", page=2)) == 2
+
+
+@pytest.mark.parametrize("query", ['"', "AND OR", "a*(b", ""])
+def test_search_tolerates_arbitrary_input(client, blend_post, query):
+    blend_post(title="Что-то", text="ничего")
+    assert _found(client, query) == []
+
+
+def test_admin_search_uses_index(admin_client, blend_post):
+    match = blend_post(title="Полярное сияние", text="текст")
+    blend_post(title="Другое", text="текст")
+    response = admin_client.get("/admin/blog/post/", {"q": "сияние"})
+    assert response.status_code == 200
+    results = list(response.context["cl"].result_list)
+    assert [post.id for post in results] == [match.id]
+
+
+@pytest.mark.parametrize("query", ["сиян", "Погод", "alice", "Погода сиян"])
+def test_admin_search_keeps_related_lookups(admin_client, mixer: Mixer,
+                                            published_category, query):
+    published_category.title = "Погода"
+    published_category.save()
+    author = mixer.blend("auth.User", username="alice_writer")
+    match = mixer.blend(
+        "blog.Post", title="Полярное сияние", text="текст", author=author,
+        category=published_category,
+    )
+    response = admin_client.get("/admin/blog/post/", {"q": query})
+    assert response.status_code == 200
+    results = list(response.context["cl"].result_list)
+    assert [post.id for post in results] == [match.id], (
+        "Убедитесь, что поиск в админке по-прежнему находит записи по"
+        " части имени автора и названию категории."
+    )
+
+
+def test_search_triggers_exist_after_migrations():
+    from blog.search import get_missing_search_triggers
+
+    assert get_missing_search_triggers() == [], (
+        "Убедитесь, что после миграций на таблице `blog_post` остаются"
+        " триггеры полнотекстового индекса."
+    )
+
+
+def test_lost_search_triggers_are_restored(client, blend_post):
+    from django.db import connection
+
+    from blog.search import FTS_TRIGGERS, restore_search_index
+
+    with connection.cursor() as cursor:
+        for name in FTS_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER {name}")
+    post = blend_post(title="Рассвет", text="текст")
+    assert restore_search_index() == list(FTS_TRIGGERS)
+    assert _found(client, "рассвет") == [post.id]
+    post.title = "Закат"
+    post.save()
+    assert _found(client, "закат") == [post.id]
+
+
+def test_search_page_loads_suggestions_script(client):
+    content = client.get("/search/").content.decode()
+    assert "<script>" not in content, (
+        "Убедитесь, что скрипт подсказок подключается из статического"
+        " файла, а не встраивается в шаблон."
+    )
+    assert "blog/js/search_suggestions.js" in content
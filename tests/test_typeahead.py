@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    from blog import typeahead
+
+    typeahead.index.rebuild()
+    yield typeahead.index
+    typeahead.index.invalidate()
+
+
+def fresh_index_labels():
+    from blog import typeahead
+
+    return [item["label"] for item in typeahead.index.items.values()]
+
+
+def _suggest(client, query):
+    response = client.get("/search/suggest/", {"q": query})
+    assert response.status_code == 200
+    return [(item["type"], item["label"]) for item in response.json()[
+        "results"
+    ]]
+
+
+def test_suggestions_cover_posts_categories_and_users(
+        client, mixer: Mixer, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        category = mixer.blend(
+            "blog.Category", title="Горы Кавказа", is_published=True
+        )
+        user = mixer.blend("auth.User", username="горец")
+        post = mixer.blend(
+            "blog.Post",
+            title="Вершины и перевалы",
+            author=user,
+            category=category,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+    assert set(_suggest(client, "го")) == {
+        ("category", "Горы Кавказа"),
+        ("user", "горец"),
+    }
+    assert _suggest(client, "пер") == [("post", "Вершины и перевалы")], (
+        "Убедитесь, что подсказки находят публикации по началу любого"
+        " слова заголовка."
+    )
+    assert _suggest(client, "и пер") == [("post", "Вершины и перевалы")]
+    assert _suggest(client, "и вер") == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.is_published = False
+        post.save()
+    assert _suggest(client, "вер") == [], (
+        "Убедитесь, что снятые с публикации посты пропадают из подсказок."
+    )
+
+
+def test_suggestions_wait_for_commit(
+        mixer: Mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    from blog.typeahead import suggest
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        mixer.blend(
+            "blog.Post",
+            title="Черновик",
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+        assert suggest("черн") == [], (
+            "Убедитесь, что подсказки обновляются только после фиксации"
+            " транзакции."
+        )
+    for callback in callbacks:
+        callback()
+    assert [item["label"] for item in suggest("черн")] == ["Черновик"]
+
+
+def test_updates_during_rebuild_are_replayed(
+        fresh_index, mixer: Mixer, user, published_category, monkeypatch
+):
+    load = fresh_index._load
+
+    def load_and_update():
+        items = load()
+        fresh_index.update("user", user.pk + 1000, "опоздавший", "late")
+        return items
+
+    monkeypatch.setattr(fresh_index, "_load", load_and_update)
+    fresh_index.rebuild()
+    assert [item["label"] for item in fresh_index.suggest("опозд")] == [
+        "опоздавший"
+    ], (
+        "Убедитесь, что изменения, пришедшие во время перестроения"
+        " индекса, не теряются."
+    )
+
+
+def test_first_request_does_not_build_index(client, monkeypatch):
+    from blog.typeahead import PrefixIndex
+
+    cold_index = PrefixIndex()
+    monkeypatch.setattr("blog.typeahead.index", cold_index)
+    monkeypatch.setattr(cold_index, "_rebuild_in_background", lambda: None)
+    assert _suggest(client, "го") == []
+    assert cold_index.rebuilding, (
+        "Убедитесь, что индекс подсказок строится в фоне, а не внутри"
+        " первого запроса."
+    )
+
+
+def test_index_stores_tokens_not_suffixes(fresh_index):
+    fresh_index.update("post", 0, "Один два три", 0)
+    assert [key for key, item_key in fresh_index.recent
+            if item_key == ("post", 0)] == ["два", "один", "три"]
+
+
+def test_suggestions_skip_scheduled_posts(
+        client, mixer: Mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend(
+            "blog.Post",
+            title="Будущее",
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=timezone.now() + timedelta(days=1),
+        )
+    assert "Будущее" in fresh_index_labels()
+    assert _suggest(client, "буд") == []
+
+
+def test_suggestions_do_not_query_database(
+        client, django_assert_max_num_queries, mixer: Mixer, user
+):
+    from blog.typeahead import suggest
+
+    suggest("a")
+    with django_assert_max_num_queries(0):
+        suggest(user.username[:2])
+
+
+def test_update_does_not_mutate_scanned_list(fresh_index):
+    fresh_index.update("post", 0, "Один", 0)
+    scanned = fresh_index.recent
+    snapshot = list(scanned)
+    fresh_index.update("post", 1, "Один два", 1)
+    fresh_index.remove("post", 0)
+    assert scanned == snapshot, (
+        "Убедитесь, что обновление индекса не меняет список, который"
+        " может обходить параллельный запрос."
+    )
+    assert [key for key, _ in fresh_index.recent] == ["два", "один"]
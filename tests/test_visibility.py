@@ -0,0 +1,54 @@
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _is_visible(post):
+    post.refresh_from_db(fields=["is_visible"])
+    return post.is_visible
+
+
+def test_is_visible_follows_post_and_category(
+        mixer: Mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    assert _is_visible(post)
+
+    post.is_published = False
+    post.save()
+    assert not _is_visible(post), (
+        "Убедитесь, что снятая с публикации запись не видна в ленте."
+    )
+
+    post.is_published = True
+    post.save()
+    published_category.is_published = False
+    published_category.save()
+    assert not _is_visible(post), (
+        "Убедитесь, что снятие категории с публикации скрывает все её"
+        " публикации."
+    )
+
+    published_category.is_published = True
+    published_category.save()
+    assert _is_visible(post)
+
+    published_category.delete()
+    assert not _is_visible(post)
+
+
+def test_refresh_visibility_command(mixer: Mixer, user, published_category):
+    from blog.models import Post
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    Post.objects.filter(pk=post.pk).update(is_visible=False)
+    call_command("refresh_visibility")
+    assert _is_visible(post)